@@ -0,0 +1,84 @@
+"""
+anomaly.py — Streaming outlier filter for fetched quotes
+
+Each series keeps an EWMA of its log price and an EWMA variance of the
+deviations, in cache["anomaly"][series]. A new quote is judged by how many
+(robust-floored) standard deviations it sits from that recent level:
+
+  accept  |z| ≤ Z_REJECT, or the series is still warming up
+  reject  otherwise — the quote is dropped and the caller falls back
+  shift   rejected quotes from REGIME_RUNS runs in a row that agree within
+          REGIME_TOL are a real level change (e.g. a devaluation), not
+          noise — the last one is accepted and the filter re-centres on it
+
+A run can quote one series several times (Yahoo, then each Stooq symbol),
+so pending observations are keyed by run (start_run()): a second rejected
+quote in the same run replaces that run's entry instead of adding one.
+
+Updates are O(1) per observation. Every decision is logged with its reason.
+The static BOUNDS in fetcher.py stay as a coarse last resort for garbage
+(a scraper matching the wrong number, a unit change).
+"""
+
+import math
+import threading
+import time
+
+ALPHA       = 0.1    # weight of the newest observation
+Z_REJECT    = 6.0
+MIN_SIGMA   = 0.01   # 1% floor on the typical move, so calm series still move
+WARMUP      = 5      # observations before the filter starts rejecting
+REGIME_RUNS = 3
+REGIME_TOL  = 0.03   # rejected quotes within 3% of each other "agree"
+
+_lock = threading.Lock()
+_run  = {"id": time.time()}   # this process's run, until start_run()
+
+
+def start_run(ts=None):
+    """Mark the start of a fetch run (fetch_all_data calls this)."""
+    _run["id"] = ts or time.time()
+
+
+def screen(cache, series, value):
+    """Judge one quote for series and learn from it. Returns True to accept."""
+    if not value or value <= 0:
+        return False
+    x = math.log(value)
+    with _lock:
+        st = cache.setdefault("anomaly", {}).setdefault(
+            series, {"mean": x, "var": 0.0, "n": 0, "pending": []})
+        sigma = max(math.sqrt(st["var"]), MIN_SIGMA)
+        z = (x - st["mean"]) / sigma
+        level = math.exp(st["mean"])
+
+        if st["n"] < WARMUP or abs(z) <= Z_REJECT:
+            reason = "warming up" if st["n"] < WARMUP else f"z={z:+.1f}"
+            _learn(st, x)
+            print(f"[DEBUG] anomaly: {series} {value:,.2f} accepted ({reason}, "
+                  f"level {level:,.2f})")
+            return True
+
+        run = _run["id"]
+        st["pending"] = ([p for p in st["pending"] if p[0] != run] + [[run, x]])[-REGIME_RUNS:]
+        xs = [p[1] for p in st["pending"]]
+        if len(xs) == REGIME_RUNS and max(xs) - min(xs) <= REGIME_TOL:
+            st["mean"], st["var"], st["pending"] = x, MIN_SIGMA ** 2, []
+            st["n"] += 1
+            print(f"[WARN] anomaly: {series} {value:,.2f} accepted as a level shift "
+                  f"({REGIME_RUNS} consistent runs, was {level:,.2f})")
+            return True
+
+        print(f"[WARN] anomaly: {series} {value:,.2f} rejected (z={z:+.1f}, "
+              f"level {level:,.2f} ± {sigma * 100:.1f}%, "
+              f"{len(xs)}/{REGIME_RUNS} runs toward a level shift)")
+        return False
+
+
+def _learn(st, x):
+    diff = x - st["mean"]
+    incr = ALPHA * diff
+    st["mean"] += incr
+    st["var"] = (1 - ALPHA) * (st["var"] + diff * incr)
+    st["n"] += 1
+    st["pending"] = []
@@ -0,0 +1,165 @@
+"""
+aza_ring.py — Aza Index history at run resolution
+
+One point per image run (RUN_HOURS, 3 a day) with its component scores,
+kept in a fixed 30-day ring buffer at history/aza_runs.bin (committed back
+with the rest of history/).
+
+Runs are numbered  day.toordinal() × RUNS_PER_DAY + slot,  where slot is the
+scheduled run a timestamp falls in, and run n lives at index n % CAPACITY.
+So "same time yesterday" is run − 3 and "a week ago" is run − 21: a direct
+index, checked against the run number stored in the slot (an empty or
+overwritten slot answers None). A second run in the same slot — a manual
+re-run — replaces the first.
+
+File layout (little-endian):
+  header  magic, version, runs per day, capacity, latest run number
+  slots   capacity × (run, ts, total, fx, inflation, fuel, crypto, stock)
+Component scores of 255 mean "unknown" (points seeded from daily history).
+"""
+
+import bisect
+import datetime
+import os
+import struct
+
+import history_store
+
+RING_FILE    = os.path.join(history_store.HISTORY_DIR, "aza_runs.bin")
+RUN_HOURS    = (7, 12, 18)          # post.yml cron hours, UTC
+RUNS_PER_DAY = len(RUN_HOURS)
+DAYS         = 30
+CAPACITY     = RUNS_PER_DAY * DAYS
+COMPONENTS   = ("fx", "inflation", "fuel", "crypto", "stock")
+UNKNOWN      = 255
+
+MAGIC   = b"AZAR"
+VERSION = 1
+HEADER  = struct.Struct("<4sHHIi")
+SLOT    = struct.Struct("<id6B")
+
+
+def run_number(ts):
+    """The scheduled run a POSIX time belongs to (runs before the first hour count as it)."""
+    dt = datetime.datetime.fromtimestamp(ts, datetime.timezone.utc)
+    slot = max(0, bisect.bisect_right(RUN_HOURS, dt.hour) - 1)
+    return dt.date().toordinal() * RUNS_PER_DAY + slot
+
+
+def run_day(run):
+    return datetime.date.fromordinal(run // RUNS_PER_DAY)
+
+
+def _empty():
+    return {"latest": 0, "slots": bytearray(CAPACITY * SLOT.size)}
+
+
+def load(path=RING_FILE):
+    """The ring from disk; an empty one if missing or laid out differently."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return _empty()
+    if len(raw) != HEADER.size + CAPACITY * SLOT.size:
+        return _empty()
+    magic, version, runs_per_day, capacity, latest = HEADER.unpack_from(raw)
+    if (magic, version, runs_per_day, capacity) != (MAGIC, VERSION, RUNS_PER_DAY, CAPACITY):
+        return _empty()
+    return {"latest": latest, "slots": bytearray(raw[HEADER.size:])}
+
+
+def save(ring, path=RING_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RUNS_PER_DAY, CAPACITY, ring["latest"]))
+        f.write(ring["slots"])
+    os.replace(path + ".tmp", path)
+
+
+def _put(ring, run, ts, total, components):
+    SLOT.pack_into(ring["slots"], (run % CAPACITY) * SLOT.size, run, ts, total, *components)
+    ring["latest"] = max(ring["latest"], run)
+
+
+def record(ring, ts, aza):
+    """Store one run's calculate_aza_index() result. O(1). Returns its run number."""
+    run = run_number(ts)
+    _put(ring, run, ts, aza["total"], [aza[c] for c in COMPONENTS])
+    return run
+
+
+def seed(ring, rows):
+    """Fill empty days from daily (day, value) history — one point at each day's first slot."""
+    for day, value in rows:
+        run = datetime.date.fromisoformat(day).toordinal() * RUNS_PER_DAY
+        if run > ring["latest"] - CAPACITY and get(ring, run) is None:
+            ts = datetime.datetime.fromisoformat(day).replace(
+                tzinfo=datetime.timezone.utc).timestamp()
+            _put(ring, run, ts, round(value), [UNKNOWN] * len(COMPONENTS))
+
+
+def get(ring, run):
+    """{"run", "ts", "total", <components>} for a run, or None if not stored. O(1)."""
+    if not ring["latest"] or not ring["latest"] - CAPACITY < run <= ring["latest"]:
+        return None
+    stored, ts, total, *scores = SLOT.unpack_from(ring["slots"], (run % CAPACITY) * SLOT.size)
+    if stored != run:
+        return None
+    point = {"run": run, "ts": ts, "total": total}
+    point.update({c: (s if s != UNKNOWN else None) for c, s in zip(COMPONENTS, scores)})
+    return point
+
+
+def latest(ring):
+    return get(ring, ring["latest"])
+
+
+def runs_ago(ring, n):
+    """The point n scheduled runs before the latest one (3 = same time yesterday)."""
+    return get(ring, ring["latest"] - n)
+
+
+def points(ring):
+    """Every stored point in run order — one pass over the fixed-size ring."""
+    first = ring["latest"] - CAPACITY + 1
+    return [p for p in (get(ring, run) for run in range(first, ring["latest"] + 1)) if p]
+
+
+def total_range(ring):
+    """(low, high) Aza total over the ring's 30 days, or (None, None) when empty."""
+    totals = [p["total"] for p in points(ring)]
+    return (min(totals), max(totals)) if totals else (None, None)
+
+
+def daily(ring, days):
+    """The last run of each of the newest `days` days that have one, oldest first."""
+    picked = []
+    for p in reversed(points(ring)):
+        if not picked or run_day(p["run"]) != run_day(picked[-1]["run"]):
+            picked.append(p)
+            if len(picked) == days:
+                break
+    return picked[::-1]
+
+
+def trend(ring):
+    """
+    The latest total and how it moved, for the card and the text posts:
+    aza, aza_day_chg (vs the same run yesterday, None without one),
+    aza_chg (vs the same run a week ago, else the oldest run within the
+    week, else 0) and aza_30d_lo / aza_30d_hi. {} when the ring is empty.
+    """
+    now = latest(ring)
+    if now is None:
+        return {}
+    week = 7 * RUNS_PER_DAY
+    yesterday = runs_ago(ring, RUNS_PER_DAY)
+    week_ago = runs_ago(ring, week) or next(
+        (p for p in points(ring) if p["run"] > ring["latest"] - week), None)
+    lo, hi = total_range(ring)
+    return {"aza":         now["total"],
+            "aza_day_chg": now["total"] - yesterday["total"] if yesterday else None,
+            "aza_chg":     now["total"] - week_ago["total"] if week_ago else 0,
+            "aza_30d_lo":  lo,
+            "aza_30d_hi":  hi}
@@ -0,0 +1,86 @@
+"""
+aza_vector.py — Vectorized Aza Index scorer
+
+Scores whole arrays of inputs at once — months of stored history, or one
+input set under many weightings — with the same results as
+fetcher.calculate_aza_index() row for row.
+
+Each component is a breakpoint table scored with np.searchsorted:
+  side="right"  counts breakpoints ≤ x, i.e. the scalar's `x < b` ladders
+                (and `x >= b` ladders, whose scores simply ascend)
+  side="left"   counts breakpoints < x, i.e. the scalar's `x > b` ladder
+Stock momentum has one extra rule: exactly 0 scores 50.
+Totals use the scalar's weighted-sum order and round half to even, as
+Python's round() does, so ties land on the same integer.
+"""
+
+import numpy as np
+
+# component → (breakpoints, scores, searchsorted side); len(scores) = len(bps) + 1
+AZA_TABLES = {
+    # FX spread %: <2 → 95, <5 → 70, <10 → 40, <20 → 15, else 5
+    "fx":        (np.array([2, 5, 10, 20]),       np.array([95, 70, 40, 15, 5]),          "right"),
+    # Headline CPI %: <10 → 100, <15 → 80, <20 → 60, <28 → 40, <35 → 20, else 5
+    "inflation": (np.array([10, 15, 20, 28, 35]), np.array([100, 80, 60, 40, 20, 5]),     "right"),
+    # Litres per $1: ≥3 → 100, ≥2.5 → 80, ≥2 → 60, ≥1.5 → 40, ≥1 → 20, else 5
+    "fuel":      (np.array([1.0, 1.5, 2.0, 2.5, 3.0]), np.array([5, 20, 40, 60, 80, 100]), "right"),
+    # USDT premium %: <2 → 90, <5 → 65, <10 → 40, <20 → 15, else 5
+    "crypto":    (np.array([2, 5, 10, 20]),       np.array([90, 65, 40, 15, 5]),          "right"),
+    # NGX daily %: >3 → 100, >1 → 80, >0 → 65, (==0 → 50), >-1 → 35, >-3 → 20, else 5
+    "stock":     (np.array([-3, -1, 0, 1, 3]),    np.array([5, 20, 35, 65, 80, 100]),     "left"),
+}
+
+AZA_WEIGHTS = {"fx": 0.30, "inflation": 0.25, "fuel": 0.20, "crypto": 0.15, "stock": 0.10}
+
+ZONE_BREAKS = np.array([25, 50, 75])
+ZONES       = np.array(["CRISIS", "STRESSED", "STRAINED", "STRONG"])
+
+
+def component_scores(name, values, tables=AZA_TABLES):
+    bps, scores, side = tables[name]
+    out = scores[np.searchsorted(bps, np.asarray(values, dtype=np.float64), side=side)]
+    if name == "stock":
+        out = np.where(np.asarray(values) == 0, 50, out)
+    return out
+
+
+def score_arrays(spread_pct, inflation, litres_per_dollar, crypto_prem, ngx_chg,
+                 weights=AZA_WEIGHTS, tables=AZA_TABLES):
+    """
+    Component scores, total and zone for every row.
+    Returns {"fx", "inflation", "fuel", "crypto", "stock", "total", "zone"} arrays.
+    """
+    inputs = {"fx": spread_pct, "inflation": inflation, "fuel": litres_per_dollar,
+              "crypto": crypto_prem, "stock": ngx_chg}
+    result = {name: component_scores(name, inputs[name], tables) for name in AZA_WEIGHTS}
+    total = np.zeros(len(result["fx"]))
+    for name in AZA_WEIGHTS:          # same order as the scalar's weighted sum
+        total = total + result[name] * weights[name]
+    result["total"] = np.round(total).astype(int)
+    result["zone"]  = ZONES[np.searchsorted(ZONE_BREAKS, result["total"], side="right")]
+    return result
+
+
+def inputs_from_rows(rows):
+    """
+    Input arrays from data dicts, with calculate_aza_index()'s defaults:
+    the USDT premium falls back to spread_pct when usdt_p2p is absent or
+    equal to the parallel rate, and a missing NGX change counts as 0.
+    """
+    spread, inf, lpd, prem, ngx = [], [], [], [], []
+    for d in rows:
+        spread.append(d.get("spread_pct", 8))
+        inf.append(d.get("inflation", 33))
+        lpd.append(d.get("litres_per_dollar", 1.5))
+        p2p, cbn = d.get("usdt_p2p", 0), d.get("cbn", 1)
+        if cbn > 0 and p2p > 0 and p2p != d.get("parallel"):
+            prem.append(((p2p - cbn) / cbn) * 100)
+        else:
+            prem.append(d.get("spread_pct", 5))
+        ngx.append(d.get("ngx_chg") or 0)
+    return spread, inf, lpd, prem, ngx
+
+
+def score_rows(rows, weights=AZA_WEIGHTS):
+    """score_arrays() over a list of data dicts."""
+    return score_arrays(*inputs_from_rows(rows), weights=weights)
@@ -0,0 +1,227 @@
+"""
+backtest.py — Replay stored history through the Aza Index under other settings
+
+Answers "what would the index have read under different weights or
+breakpoints" without touching calculate_aza_index(). Daily inputs are
+rebuilt from the history store (or a CSV), then every configuration in the
+weight × breakpoint grid is scored with the vectorized tables in
+aza_vector.py, fanned out across a process pool.
+
+Inputs per day, derived exactly as fetch_all_data() does:
+  spread_pct         (parallel − cbn) / cbn × 100   cbn falls back to Stooq usdngn
+  litres_per_dollar  parallel / petrol
+  inflation          latest reading on or before the day
+  crypto premium     = spread_pct (usdt_p2p is the parallel rate)
+  ngx_chg            day-on-day change of the stored NGX index
+Missing inputs take calculate_aza_index()'s defaults.
+
+Usage:
+  python backtest.py                               # 0.05 weight grid, breakpoints ×1
+  python backtest.py --start 2023-01-01 --end 2023-12-31 --bp-scales 0.8,0.9,1,1.1,1.2
+  python backtest.py --csv inputs.csv --step 0.1 --out sweep.npz
+
+A CSV has a `date` column (YYYY-MM-DD) plus any of the series columns
+parallel, cbn, usdngn, petrol, inflation, ngx, ngx_chg; they override the
+stored series of the same name.
+
+Results go to one compressed .npz (one row per configuration):
+  weights (K×5), bp_scale, mean, min, max, last, vol (std of daily moves),
+  flips (zone changes), zone_share (K×4, CRISIS → STRONG)
+"""
+
+import argparse
+import csv
+import datetime
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import aza_vector
+import history_store
+
+COMPONENTS    = tuple(aza_vector.AZA_WEIGHTS)
+INPUT_SERIES  = ("parallel", "cbn", "usdngn", "petrol", "inflation", "ngx", "ngx_chg")
+DEFAULT_OUT   = "backtest_results.npz"
+BLOCK_SIZE    = 256    # weight vectors per pool task
+
+# ─── Inputs ───────────────────────────────────────────────────────────────────
+
+def read_csv(path):
+    """{series: (day ordinals, values)} from a CSV with a date column."""
+    cols = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            day = datetime.date.fromisoformat(row.pop("date")).toordinal()
+            for name, value in row.items():
+                if name in INPUT_SERIES and value not in ("", None):
+                    cols.setdefault(name, {})[day] = float(value)
+    return {name: (np.array(sorted(v)), np.array([v[d] for d in sorted(v)]))
+            for name, v in cols.items()}
+
+
+def load_series(csv_path=None):
+    series = {}
+    for name in INPUT_SERIES:
+        days, vals = history_store.columns(name)
+        if len(days):
+            series[name] = (np.array(days, dtype=np.int64), np.array(vals))
+    if csv_path:
+        series.update(read_csv(csv_path))
+    return series
+
+
+def _as_of(series, name, days):
+    """Latest value on or before each day (NaN before the series starts)."""
+    if name not in series:
+        return np.full(len(days), np.nan)
+    sdays, vals = series[name]
+    i = np.searchsorted(sdays, days, side="right") - 1
+    return np.where(i >= 0, vals[np.maximum(i, 0)], np.nan)
+
+
+def _on(sdays, vals, days):
+    """Value on exactly each day (NaN where the series has no row)."""
+    i = np.minimum(np.searchsorted(sdays, days), len(sdays) - 1)
+    return np.where(sdays[i] == days, vals[i], np.nan)
+
+
+def build_inputs(series, start=None, end=None):
+    """(days, {component: input array}) for every stored parallel-rate day."""
+    if "parallel" not in series:
+        raise SystemExit("[WARN] Backtest: no parallel-rate history to replay")
+    days, parallel = series["parallel"]
+    keep = np.ones(len(days), dtype=bool)
+    if start:
+        keep &= days >= datetime.date.fromisoformat(start).toordinal()
+    if end:
+        keep &= days <= datetime.date.fromisoformat(end).toordinal()
+    days, parallel = days[keep], parallel[keep]
+
+    cbn = _as_of(series, "cbn", days)
+    cbn = np.where(np.isnan(cbn), _as_of(series, "usdngn", days), cbn)
+    spread = np.round(np.round(parallel - cbn) / cbn * 100, 2)
+    spread = np.where(np.isnan(spread), 8, spread)
+
+    lpd = np.round(parallel / _as_of(series, "petrol", days), 2)
+    lpd = np.where(np.isnan(lpd), 1.5, lpd)
+
+    inflation = _as_of(series, "inflation", days)
+    inflation = np.where(np.isnan(inflation), 33, inflation)
+
+    if "ngx_chg" in series:
+        ngx_chg = _on(*series["ngx_chg"], days)
+    elif "ngx" in series and len(series["ngx"][0]) > 1:
+        ngx_days, level = series["ngx"]
+        ngx_chg = _on(ngx_days[1:], np.round((level[1:] / level[:-1] - 1) * 100, 2), days)
+    else:
+        ngx_chg = np.full(len(days), np.nan)
+    ngx_chg = np.where(np.isnan(ngx_chg), 0, ngx_chg)
+
+    return days, {"fx": spread, "inflation": inflation, "fuel": lpd,
+                  "crypto": spread, "stock": ngx_chg}
+
+# ─── Configuration grid ───────────────────────────────────────────────────────
+
+def weight_grid(step, floor):
+    """Every weight vector on a step grid that sums to 1, each weight ≥ floor."""
+    units = round(1 / step)
+    low = round(floor / step)
+    grid = [combo + (units - sum(combo),)
+            for combo in itertools.product(range(low, units + 1), repeat=len(COMPONENTS) - 1)
+            if units - sum(combo) >= low]
+    # round() so 6 × 0.05 is the same float as the literal 0.30
+    return np.round(np.array(grid, dtype=np.float64) * step, 10)
+
+
+def scaled_tables(scale):
+    return {name: (bps * scale, scores, side)
+            for name, (bps, scores, side) in aza_vector.AZA_TABLES.items()}
+
+# ─── Scoring (pool workers) ───────────────────────────────────────────────────
+
+_inputs = None
+
+
+def _init(inputs):
+    global _inputs
+    _inputs = inputs
+
+
+def _run_block(scale, weights):
+    """Summaries for one breakpoint scale and a block of weight vectors."""
+    tables = scaled_tables(scale)
+    scores = [aza_vector.component_scores(name, _inputs[name], tables) for name in COMPONENTS]
+    total = np.zeros((len(weights), len(scores[0])))
+    for c, s in enumerate(scores):      # same order as the scalar's weighted sum
+        total = total + weights[:, c, None] * s
+    total = np.round(total)
+    zone = np.searchsorted(aza_vector.ZONE_BREAKS, total, side="right")
+    moves = np.diff(total, axis=1)
+    return {
+        "mean":       total.mean(axis=1),
+        "min":        total.min(axis=1),
+        "max":        total.max(axis=1),
+        "last":       total[:, -1],
+        "vol":        moves.std(axis=1) if moves.shape[1] else np.zeros(len(weights)),
+        "flips":      (np.diff(zone, axis=1) != 0).sum(axis=1),
+        "zone_share": np.stack([(zone == z).mean(axis=1)
+                                for z in range(len(aza_vector.ZONES))], axis=1),
+    }
+
+
+def sweep(inputs, weights, scales, workers=None):
+    """Score weights × scales across a process pool. Returns the results dict."""
+    tasks = [(scale, weights[i:i + BLOCK_SIZE])
+             for scale in scales for i in range(0, len(weights), BLOCK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init,
+                             initargs=(inputs,)) as pool:
+        blocks = list(pool.map(_run_block, *zip(*tasks)))
+    results = {key: np.concatenate([b[key] for b in blocks]) for key in blocks[0]}
+    results["weights"]  = np.concatenate([w for _, w in tasks])
+    results["bp_scale"] = np.concatenate([np.full(len(w), s) for s, w in tasks])
+    return results
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+def main():
+    ap = argparse.ArgumentParser(description="Aza Index backtest and weight sweep")
+    ap.add_argument("--csv", help="CSV of daily inputs (overrides stored series)")
+    ap.add_argument("--start", help="first day, YYYY-MM-DD")
+    ap.add_argument("--end", help="last day, YYYY-MM-DD")
+    ap.add_argument("--step", type=float, default=0.05, help="weight grid step")
+    ap.add_argument("--floor", type=float, default=0.05, help="minimum weight")
+    ap.add_argument("--bp-scales", default="1", help="breakpoint multipliers, comma-separated")
+    ap.add_argument("--workers", type=int, help="pool size (default: CPU count)")
+    ap.add_argument("--out", default=DEFAULT_OUT)
+    args = ap.parse_args()
+
+    started = time.time()
+    days, inputs = build_inputs(load_series(args.csv), args.start, args.end)
+    if not len(days):
+        raise SystemExit("[WARN] Backtest: no days in range")
+    weights = weight_grid(args.step, args.floor)
+    scales = [float(s) for s in args.bp_scales.split(",")]
+    results = sweep(inputs, weights, scales, args.workers)
+
+    first, last = (datetime.date.fromordinal(int(d)).isoformat() for d in (days[0], days[-1]))
+    np.savez_compressed(args.out, components=np.array(COMPONENTS), zones=aza_vector.ZONES,
+                        first_day=first, last_day=last, days=len(days), **results)
+    print(f"[INFO] Backtest: {len(results['mean']):,} configurations × {len(days):,} days "
+          f"({first} → {last}) in {time.time() - started:.1f}s → {args.out}")
+
+    live = aza_vector.score_arrays(inputs["fx"], inputs["inflation"], inputs["fuel"],
+                                   inputs["crypto"], inputs["stock"])["total"]
+    print(f"  Current weights: mean {live.mean():.1f}, range {live.min()}–{live.max()}, "
+          f"last {live[-1]}")
+    order = np.argsort(results["vol"])
+    for label, i in (("Calmest", order[0]), ("Most volatile", order[-1])):
+        w = ", ".join(f"{c} {x:.2f}" for c, x in zip(COMPONENTS, results["weights"][i]))
+        print(f"  {label}: {w} (breakpoints ×{results['bp_scale'][i]:g}) — "
+              f"mean {results['mean'][i]:.1f}, daily σ {results['vol'][i]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
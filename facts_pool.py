@@ -21,6 +21,8 @@ Placeholders available (all calculated live at post time):
   {ngx}               — NGX All-Share Index today
 """
 
+import metrics
+
 FACTS = [
 
     # ── NAIRA DEVALUATION HISTORY ────────────────────────────────────────────
@@ -1070,6 +1072,33 @@ FACTS = [
 ]
 
 
+# Fallbacks for inputs missing from live_data. Derived values such as
+# salary_usd are always computed from these (500000 / 1499 → 334), not
+# fixed literals as before metrics.py (salary_usd used to default to 333).
+FACT_DEFAULTS = {
+    "parallel":      1499,
+    "cbn":           1346,
+    "inflation":     33.2,
+    "petrol":        897,
+    "diesel":        1450,
+    "lpg_kg":        1200,
+    "ngx":           104520,
+    "rice_50kg":     95000,
+    "tomato_basket": 3000,
+    "egg_crate":     3200,
+    "bread_loaf":    1200,
+}
+
+# Template placeholder → metrics.METRICS node of the same value
+FACT_ALIASES = {
+    "petrol_cost_50L":  "tank_cost",
+    "paystack_deval":   "deval_from_2020",
+    "rice_dollar_cost": "deval_from_2020",
+    "remit_500":        "parallel_500",
+    "lpg_per_kg":       "lpg_kg",
+}
+
+
 def get_fact_count():
     return len(FACTS)
 
@@ -1086,125 +1115,14 @@ def render_fact(index, live_data):
     """
     Render a fact template with live data values.
     Returns the formatted tweet text, or None if rendering fails.
+    Only the placeholders the template references are computed (see metrics.py).
     """
     if index >= len(FACTS):
         return None
 
     fact = FACTS[index]
     template = fact["text"]
-
-    # Build substitution dict from live_data
-    parallel  = live_data.get("parallel", 1499)
-    inflation = live_data.get("inflation", 33.2)
-    petrol    = live_data.get("petrol", 897)
-    ngx       = live_data.get("ngx", 104520)
-    yr        = live_data.get("yr", 2026)
-    salary_usd = live_data.get("salary_usd", 333)
-
-    # Pre-computed dynamic values
-    deval_pct       = round(((parallel - 0.66) / 0.66) * 100, 1)
-    deval_from_2015 = round(((parallel - 197) / 197) * 100, 1)
-    deval_from_2020 = round(((parallel - 360) / 360) * 100, 1)
-    deval_from_2023 = round(((parallel - 460) / 460) * 100, 1)
-    petrol_cost_50L = 50 * petrol
-    inflation_vs_target = round(inflation / 9, 1)
-    real_return     = round(11 - inflation, 1)   # assuming 11% savings rate
-    tbill_real      = round(20 - inflation, 1)   # assuming 20% T-bill yield
-    inflation_erosion = round(100000 * (1 - (1 / (1 + inflation/100))), 0)
-
-    # Custom calcs
-    litres_per_1k   = round(1000 / petrol, 2) if petrol else 0
-    min_wage_usd    = round(70000 / parallel, 1) if parallel else 0
-    parallel_500    = round(500 * parallel, 0)
-    parallel_1000   = round(1000 * parallel, 0)
-    doctor_uk_naira = round(8000 * parallel, 0)
-    external_debt_ngn = round(42.3 * parallel / 1000, 2)   # in trillions
-    remittance_ngn  = round(20 * parallel / 1000, 1)       # $20B in trillions
-    paystack_deval  = round(((parallel - 360) / 360) * 100, 1)
-    poverty_line_naira = round(2.15 * parallel, 0)
-    min_wage_daily     = round(70000 / 22, 0)                          # ₦/working day
-    min_wage_poverty_x = round((70000 / 22) / (2.15 * parallel / parallel), 1)  # x poverty line per day — always same
-    min_wage_poverty_x = round(min_wage_daily / poverty_line_naira, 1)  # days wage vs poverty line naira
-    tank_days_wages    = round((50 * petrol) / (70000 / 22), 1)        # days of work to fill tank
-    inflation_adjusted_wage = round(30000 * (1 + 2.2), 0)              # 30k * ~3.2x cumulative since 2019
-    corruption_cost_ngn    = round(18e9 * parallel / 1e12, 1)          # ₦ trillions
-    corruption_cost_ngn_hi = round(32e9 * parallel / 1e12, 1)
-    rice_dollar_cost = round(((parallel - 360) / 360) * 100, 1)
-    uk_salary_naira = round(3500 * parallel, 0)
-    uk_multiplier   = round(uk_salary_naira / 300000, 1)
-    flare_naira     = round(2.5 * parallel / 1000, 2)
-    converted_ngn   = round(2778 * parallel, 0)
-    million_naira_petrol = round(1000000 / petrol, 1) if petrol else 0
-    remit_500       = round(500 * parallel, 0)
-    civil_servant_usd = round(150000 / parallel, 1) if parallel else 0
-    inflation_half  = round(72 / inflation, 1) if inflation else 0
-    lpg_per_kg      = live_data.get("lpg_kg", 1200)
-    rice_50kg       = live_data.get("rice_50kg", 95000)
-    tomato_basket   = live_data.get("tomato_basket", 3000)
-    egg_crate       = live_data.get("egg_crate", 3200)
-    bread_loaf      = live_data.get("bread_loaf", 1200)
-    food_daily_raw  = live_data.get("food_daily", round(rice_50kg/30 + tomato_basket/15 + bread_loaf/3, -2))
-    rice_daily      = round(rice_50kg / 30, -1)
-    rice_per_kg     = round(rice_50kg / 50, -1)
-    rice_wage_pct   = round(rice_50kg / 70000 * 100, 0)
-    food_daily      = round(food_daily_raw, -2)
-    survival_daily  = round(food_daily + 600 + 200, -2)   # food + transport + data
-    survival_monthly = round(survival_daily * 30, -2)
-
-    subs = {
-        "parallel":            parallel,
-        "cbn":                 live_data.get("cbn", 1346),
-        "inflation":           inflation,
-        "petrol":              petrol,
-        "ngx":                 ngx,
-        "yr":                  yr,
-        "salary_usd":          salary_usd,
-        "deval_pct":           deval_pct,
-        "deval_from_2015":     deval_from_2015,
-        "deval_from_2020":     deval_from_2020,
-        "deval_from_2023":     deval_from_2023,
-        "petrol_cost_50L":     petrol_cost_50L,
-        "inflation_vs_target": inflation_vs_target,
-        "real_return":         real_return,
-        "tbill_real":          tbill_real,
-        "inflation_erosion":   inflation_erosion,
-        "litres_per_1k":       litres_per_1k,
-        "min_wage_usd":        min_wage_usd,
-        "parallel_500":        parallel_500,
-        "parallel_1000":       parallel_1000,
-        "doctor_uk_naira":     doctor_uk_naira,
-        "external_debt_ngn":   external_debt_ngn,
-        "remittance_ngn":      remittance_ngn,
-        "paystack_deval":      paystack_deval,
-        "poverty_line_naira":  poverty_line_naira,
-        "rice_dollar_cost":    rice_dollar_cost,
-        "lpg_per_kg":          lpg_per_kg,
-        "diesel":              live_data.get("diesel", 1450),
-        "uk_salary_naira":     uk_salary_naira,
-        "uk_multiplier":       uk_multiplier,
-        "flare_naira":         flare_naira,
-        "converted_ngn":       converted_ngn,
-        "million_naira_petrol": million_naira_petrol,
-        "remit_500":           remit_500,
-        "civil_servant_usd":   civil_servant_usd,
-        "inflation_half":      inflation_half,
-        "rice_50kg":           rice_50kg,
-        "rice_daily":          rice_daily,
-        "rice_per_kg":         rice_per_kg,
-        "rice_wage_pct":       rice_wage_pct,
-        "egg_crate":           egg_crate,
-        "bread_loaf":          bread_loaf,
-        "food_daily":          food_daily,
-        "survival_daily":      survival_daily,
-        "survival_monthly":    survival_monthly,
-        "min_wage_daily":      min_wage_daily,
-        "min_wage_poverty_x":  min_wage_poverty_x,
-        "tank_days_wages":     tank_days_wages,
-        "min_wage_usd":        min_wage_usd,
-        "inflation_adjusted_wage": inflation_adjusted_wage,
-        "corruption_cost_ngn":     corruption_cost_ngn,
-        "corruption_cost_ngn_hi":  corruption_cost_ngn_hi,
-    }
+    subs = metrics.Metrics(live_data, FACT_DEFAULTS, FACT_ALIASES)
 
     try:
         rendered = template.format_map(subs)
@@ -18,29 +18,63 @@ FORMULA AUDIT (all verified):
 import json
 import os
 import re
-import requests
+import statistics
+import sys
+import time
 import datetime
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+import anomaly
+import aza_ring
+import fx_matrix
+import http_cache
+import history_store
+import http_client
+import metrics
+import p2p_sampler
+import rolling
+import snapshot
 
 CACHE_FILE = os.path.join(os.path.dirname(__file__), "cache.json")
 
-# Sanity bounds — fetched values outside these are rejected
+# Coarse sanity bounds — a last resort against garbage (wrong number scraped,
+# unit change). Day-to-day outliers are caught by the streaming filter in
+# anomaly.py, which judges each quote against the series' recent history.
 BOUNDS = {
-    "cbn":      (800,   3000),
-    "parallel": (900,   3500),
-    "btc_usd":  (10000, 500000),
-    "eth_usd":  (500,   20000),
-    "bnb_usd":  (50,    2000),
-    "gold_usd":   (1500, 3500),  # Gold all-time high ~$3,100 as of Feb 2026
-    "silver_usd": (15,   50),   # Silver spot ~$28-35/oz, ATH $50
-    "brent":    (20,    200),
-    "petrol":   (400,   5000),
-    "diesel":   (400,   8000),
+    "cbn":      (300,   10000),
+    "parallel": (300,   12000),
+    "btc_usd":  (1000,  5000000),
+    "eth_usd":  (50,    200000),
+    "bnb_usd":  (5,     20000),
+    "gold_usd":   (500,  15000),
+    "silver_usd": (5,    500),
+    "cocoa_usd":  (500,  50000),
+    "brent":    (10,    400),
+    "petrol":   (100,   20000),
+    "diesel":   (100,   30000),
 }
 
 # Minimum realistic spread between parallel and CBN (%)
 # Sub-2% has not been a real condition in Nigeria since 2021
 MIN_PARALLEL_SPREAD_PCT = 2.0
 
+# Worker pool size for the concurrent fetch stage. Every source is I/O-bound,
+# so this only caps how many sockets are open at once.
+FETCH_WORKERS = 8
+
+# Stooq daily CSVs are requested for a recent window only — enough calendar
+# days to span long holiday closures and still hold two closes.
+STOOQ_WINDOW_DAYS = 21
+STOOQ_CHUNK_BYTES = 2048
+
+# P2P rates are priced for a realistic order: the volume-weighted price to
+# buy P2P_TARGET_USDT through the ad book, reading at most P2P_MAX_PAGES.
+P2P_TARGET_USDT = 1000
+P2P_PAGE_WAVE   = 2
+P2P_MAX_PAGES   = 6
+
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -61,6 +95,24 @@ def date_label(dt=None):
         dt = datetime.datetime.now()
     return dt.strftime("%b-") + str(dt.day)   # str(dt.day) strips leading zero
 
+def _label_days(labels, values, now):
+    """
+    Pair old 'Feb-21' style labels (no year) with real dates: the newest
+    label falls on or before now, each earlier one in the year before it.
+    """
+    rows, year, newer = [], now.year, None
+    for label, value in reversed(list(zip(labels, values))):
+        try:
+            day = datetime.datetime.strptime(f"{label}-{year}", "%b-%d-%Y").date()
+        except ValueError:
+            continue   # Feb-29 outside a leap year
+        if day > (newer or now.date()):
+            year -= 1
+            day = day.replace(year=year)
+        rows.append((day, value))
+        newer = day
+    return rows
+
 def in_bounds(value, key):
     if value is None:
         return False
@@ -69,6 +121,15 @@ def in_bounds(value, key):
         return True
     return lo <= value <= hi
 
+def plausible(cache, series, value):
+    """Coarse BOUNDS first, then the streaming anomaly filter (needs cache)."""
+    if not in_bounds(value, series):
+        if value is not None:
+            print(f"[WARN] {series}: {value} outside coarse bounds {BOUNDS[series]}")
+        return False
+    return cache is None or anomaly.screen(cache, series, value)
+
+
 def increment_failure(cache, key):
     cache["scrape_failures"][key] = cache["scrape_failures"].get(key, 0) + 1
 
@@ -79,6 +140,111 @@ def should_alert(cache, key, threshold=3):
     return cache["scrape_failures"].get(key, 0) >= threshold
 
 
+# ─── Circuit breakers ─────────────────────────────────────────────────────────
+#
+# Sources that can stay down for days get a breaker in cache["breakers"],
+# driven by the same consecutive-failure counts as scrape_failures:
+#   closed    → called every run; trips open after BREAKER_THRESHOLD failures
+#   open      → skipped (zero network time, cached value used) until retry_at
+#   half_open → one probe run; success closes, failure re-opens with the
+#               backoff doubled (BREAKER_BASE_HOURS … BREAKER_MAX_HOURS)
+
+BREAKER_SOURCES    = ("fuel", "reserves", "ngx_movers", "wise")
+BREAKER_THRESHOLD  = 3
+BREAKER_BASE_HOURS = 6
+BREAKER_MAX_HOURS  = 96
+
+
+def _breaker(cache, source):
+    return cache.setdefault("breakers", {}).setdefault(
+        source, {"state": "closed", "backoff_h": BREAKER_BASE_HOURS})
+
+def breaker_allows(cache, source, now=None):
+    """True if the source should be called this run (moves open → half_open when due)."""
+    b = _breaker(cache, source)
+    if b["state"] != "open":
+        return True
+    now = now or datetime.datetime.now()
+    if now >= datetime.datetime.fromisoformat(b["retry_at"]):
+        b["state"] = "half_open"
+        print(f"[INFO] Breaker {source}: half-open — probing")
+        return True
+    print(f"[INFO] Breaker {source}: open until {b['retry_at']} — using cache")
+    return False
+
+def breaker_record(cache, source, ok, now=None):
+    """Record a call result, updating scrape_failures and the breaker state."""
+    b = _breaker(cache, source)
+    if ok:
+        reset_failure(cache, source)
+        if b["state"] != "closed":
+            print(f"[INFO] Breaker {source}: closed")
+        b.update({"state": "closed", "backoff_h": BREAKER_BASE_HOURS})
+        b.pop("retry_at", None)
+        return
+    increment_failure(cache, source)
+    if b["state"] == "half_open":
+        b["backoff_h"] = min(b["backoff_h"] * 2, BREAKER_MAX_HOURS)
+    elif not should_alert(cache, source, BREAKER_THRESHOLD):
+        return
+    now = now or datetime.datetime.now()
+    b["state"] = "open"
+    b["retry_at"] = (now + datetime.timedelta(hours=b["backoff_h"])).isoformat(timespec="minutes")
+    print(f"[WARN] Breaker {source}: open for {b['backoff_h']}h")
+
+def breaker_alerts(cache):
+    """One alert line per breaker that is not closed."""
+    alerts = []
+    for source, b in cache.get("breakers", {}).items():
+        if b.get("state", "closed") == "closed":
+            continue
+        fails = cache["scrape_failures"].get(source, 0)
+        alerts.append(f"Breaker {b['state'].upper()} for {source}: {fails} consecutive "
+                      f"failures, next probe {b.get('retry_at', 'this run')}")
+    return alerts
+
+def run_parallel(tasks, max_workers=FETCH_WORKERS, deadline=None, quorum=None):
+    """
+    Run {name: callable} on a bounded thread pool.
+    Returns {name: result}. A task that raises maps to None — same contract
+    as the fetch_* functions, which never raise.
+    With a deadline (seconds), tasks not finished in time also map to None:
+    queued ones are cancelled and running ones are left to their own timeout.
+    With a quorum, the call returns as soon as that many tasks produced a
+    non-None result; the stragglers are dropped the same way.
+    The deadline bounds when this call returns, not how long the process
+    runs: Python cannot stop a running thread, and the interpreter joins the
+    pool's workers at exit. A dropped task's wall-clock time is bounded only
+    by the per-request timeouts inside it, so keep those short.
+    """
+    results = {}
+    if not tasks:
+        return results
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)))
+    futures = {pool.submit(fn): name for name, fn in tasks.items()}
+    answered = 0
+    try:
+        for fut in as_completed(futures, timeout=deadline):
+            name = futures[fut]
+            try:
+                results[name] = fut.result()
+            except Exception as e:
+                print(f"[WARN] {name}: {e}")
+                results[name] = None
+            answered += results[name] is not None
+            if quorum and answered >= quorum:
+                break
+    except TimeoutError:
+        print(f"[WARN] Deadline {deadline}s hit")
+    finally:
+        late = [name for name in futures.values() if name not in results]
+        if late:
+            print(f"[DEBUG] Dropped {len(late)} unfinished: {late}")
+        for name in late:
+            results[name] = None
+        pool.shutdown(wait=not (deadline or quorum), cancel_futures=True)
+    return results
+
 # ─── Tier 1: Live APIs ─────────────────────────────────────────────────────────
 
 def fetch_exchange_rates(api_key):
@@ -87,13 +253,14 @@ def fetch_exchange_rates(api_key):
     Cross rates formula: NGN_per_X = rates["NGN"] / rates["X"]
     Reason: if 1 USD = 1600 NGN and 1 USD = 0.92 EUR,
     then 1 EUR = 1600/0.92 = 1739 NGN. Correct.
+    All crosses come from one fx_matrix.CrossRates over the full response.
     """
     if not api_key:
         print("[WARN] No ExchangeRate API key — skipping")
         return None
     try:
         url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/USD"
-        r = requests.get(url, timeout=10)
+        r = http_client.get(url, timeout=10)
         r.raise_for_status()
         resp = r.json()
         if resp.get("result") != "success":
@@ -105,10 +272,6 @@ def fetch_exchange_rates(api_key):
             print(f"[WARN] ExchangeRate-API: suspicious NGN value {ngn}")
             return None
 
-        def cross(currency):
-            x = rates.get(currency)
-            return round(ngn / x, 3) if (x and x > 0) else None
-
         # XAU = troy oz per USD (e.g. 0.000342 oz per $1)
         # Gold price USD/oz = 1 / XAU rate
         xau = rates.get("XAU")
@@ -119,16 +282,8 @@ def fetch_exchange_rates(api_key):
             print("[WARN] ExchangeRate-API: XAU not in response")
 
         return {
-            "ngn":     ngn,
-            "eur_ngn": cross("EUR"),
-            "gbp_ngn": cross("GBP"),
-            "cny_ngn": cross("CNY"),
-            "cad_ngn": cross("CAD"),
-            "kes_ngn": cross("KES"),
-            "ghs_ngn": cross("GHS"),
-            "zar_ngn": cross("ZAR"),
-            "egp_ngn": cross("EGP"),
-            "xof_ngn": cross("XOF"),
+            "ngn":         ngn,
+            **fx_matrix.CrossRates(rates).ngn_fields(),
             "gold_usd_fx": gold_usd,   # Gold from ExchangeRate-API
         }
     except Exception as e:
@@ -136,37 +291,94 @@ def fetch_exchange_rates(api_key):
         return None
 
 
+def _p2p_fill(ads, target_usdt):
+    """
+    Walk ads cheapest first, buying up to target_usdt.
+    ads: (price_ngn, qty_usdt, min_ngn, max_ngn). An ad's usable size is
+    capped by its max order, and ads whose minimum order exceeds what is
+    still needed are skipped. Returns (vwap, usdt_filled, ads_used).
+    """
+    cost = filled = used = 0
+    for price, qty, min_ngn, max_ngn in sorted(ads):
+        need = target_usdt - filled
+        if need <= 0:
+            break
+        if min_ngn and min_ngn > need * price:
+            continue
+        size = min(qty, max_ngn / price if max_ngn else qty, need)
+        if size <= 0:
+            continue
+        cost   += size * price
+        filled += size
+        used   += 1
+    return (cost / filled if filled else None), filled, used
+
+
+def _p2p_depth_price(venue, fetch_page, page_size):
+    """
+    Volume-weighted price for P2P_TARGET_USDT across the ad book.
+    Page 1 first, then further pages P2P_PAGE_WAVE at a time concurrently,
+    stopping as soon as the target is covered or the book runs out.
+    fetch_page(n) returns (usable ads, ads the venue listed on the page); the
+    book has run out when a page lists fewer than page_size ads, however many
+    survived the bounds filter. A failed page leaves the depth unknown, so
+    the venue gets no price rather than a price over a partial book.
+    page_size=None: the venue returns its whole book on page 1.
+    """
+    ads, page, wave = [], 1, 1
+    while page <= P2P_MAX_PAGES:
+        pages = range(page, min(page + wave, P2P_MAX_PAGES + 1))
+        got = run_parallel({n: (lambda n=n: fetch_page(n)) for n in pages})
+        failed = [n for n in pages if got.get(n) is None]
+        if failed:
+            print(f"[WARN] {venue} P2P: page(s) {failed} failed — depth unknown")
+            return None
+        for n in pages:
+            ads.extend(got[n][0])
+        vwap, filled, used = _p2p_fill(ads, P2P_TARGET_USDT)
+        exhausted = page_size is None or any(got[n][1] < page_size for n in pages)
+        if filled >= P2P_TARGET_USDT or exhausted:
+            break
+        page += len(pages)
+        wave = P2P_PAGE_WAVE
+    if vwap and filled >= P2P_TARGET_USDT:
+        print(f"[INFO] {venue} P2P: VWAP ₦{vwap:.0f} for ${filled:,.0f} "
+              f"across {used} ads ({page + len(pages) - 1} page(s))")
+        return round(vwap, 0)
+    print(f"[WARN] {venue} P2P: insufficient depth ({used} ads, ${filled:,.0f})")
+    return None
+
+
 def fetch_binance_p2p():
     """
-    Binance P2P USDT/NGN — average of top 5 BUY ads.
+    Binance P2P USDT/NGN — volume-weighted price to buy P2P_TARGET_USDT.
     BUY = buyer pays NGN to receive USDT = real market price for USD.
     """
-    try:
-        url = "https://p2p.binance.com/bapi/c2c/v2/friendly/c2c/adv/search"
+    url = "https://p2p.binance.com/bapi/c2c/v2/friendly/c2c/adv/search"
+
+    def page(n):
         payload = {
             "asset": "USDT", "fiat": "NGN",
-            "merchantCheck": False, "page": 1,
-            "payTypes": [], "rows": 10, "tradeType": "BUY"
+            "merchantCheck": False, "page": n,
+            "payTypes": [], "rows": 20, "tradeType": "BUY"
         }
-        r = requests.post(url, json=payload,
-                          headers={"Content-Type": "application/json",
-                                   "User-Agent": "Mozilla/5.0"}, timeout=12)
+        r = http_client.post(url, json=payload, timeout=12)
         r.raise_for_status()
-        ads = r.json().get("data", [])
-        prices = []
-        for ad in ads:
+        ads, listed = [], r.json().get("data") or []
+        for ad in listed:
             try:
-                p = float(ad["adv"]["price"])
+                adv = ad["adv"]
+                p = float(adv["price"])
                 if in_bounds(p, "parallel"):
-                    prices.append(p)
+                    ads.append((p, float(adv["tradableQuantity"]),
+                                float(adv.get("minSingleTransAmount") or 0),
+                                float(adv.get("maxSingleTransAmount") or 0)))
             except Exception:
                 pass
-        if len(prices) >= 2:
-            avg = round(sum(prices[:5]) / min(5, len(prices)), 0)
-            print(f"[INFO] Binance P2P top prices: {[int(p) for p in prices[:5]]} → avg ₦{avg:.0f}")
-            return avg
-        print("[WARN] Binance P2P: insufficient valid prices")
-        return None
+        return ads, len(listed)
+
+    try:
+        return _p2p_depth_price("Binance", page, 20)
     except Exception as e:
         print(f"[WARN] Binance P2P: {e}")
         return None
@@ -174,44 +386,76 @@ def fetch_binance_p2p():
 
 def fetch_bybit_p2p():
     """
-    Bybit P2P USDT/NGN — average of top 5 BUY offers.
+    Bybit P2P USDT/NGN — volume-weighted price to buy P2P_TARGET_USDT.
     side=0 means buyer (paying NGN to get USDT).
     """
-    try:
-        url = "https://api2.bybit.com/fiat/otc/item/online"
+    url = "https://api2.bybit.com/fiat/otc/item/online"
+
+    def page(n):
         payload = {
             "tokenId": "USDT", "currencyId": "NGN",
-            "payment": [], "side": "0", "size": "10", "page": "1"
+            "payment": [], "side": "0", "size": "10", "page": str(n)
         }
-        r = requests.post(url, json=payload,
-                          headers={"Content-Type": "application/json",
-                                   "User-Agent": "Mozilla/5.0"}, timeout=12)
+        r = http_client.post(url, json=payload, timeout=12)
         r.raise_for_status()
-        items = r.json().get("result", {}).get("items", [])
-        prices = []
-        for item in items:
+        ads, listed = [], (r.json().get("result") or {}).get("items") or []
+        for item in listed:
             try:
                 p = float(item["price"])
                 if in_bounds(p, "parallel"):
-                    prices.append(p)
+                    ads.append((p, float(item["lastQuantity"]),
+                                float(item.get("minAmount") or 0),
+                                float(item.get("maxAmount") or 0)))
             except Exception:
                 pass
-        if len(prices) >= 2:
-            avg = round(sum(prices[:5]) / min(5, len(prices)), 0)
-            print(f"[INFO] Bybit P2P top prices: {[int(p) for p in prices[:5]]} → avg ₦{avg:.0f}")
-            return avg
-        print("[WARN] Bybit P2P: insufficient valid prices")
-        return None
+        return ads, len(listed)
+
+    try:
+        return _p2p_depth_price("Bybit", page, 10)
     except Exception as e:
         print(f"[WARN] Bybit P2P: {e}")
         return None
 
 
+def fetch_okx_p2p():
+    """
+    OKX P2P USDT/NGN — volume-weighted price to buy P2P_TARGET_USDT.
+    side=sell lists merchants selling USDT, i.e. what a buyer pays.
+    One response holds the whole book, so there is no paging.
+    """
+    url = "https://www.okx.com/v3/c2c/tradingOrders/books"
+
+    def page(n):
+        params = {
+            "quoteCurrency": "ngn", "baseCurrency": "usdt", "side": "sell",
+            "paymentMethod": "all", "userType": "all",
+        }
+        r = http_client.get(url, params=params, timeout=12)
+        r.raise_for_status()
+        ads, listed = [], (r.json().get("data") or {}).get("sell") or []
+        for item in listed:
+            try:
+                p = float(item["price"])
+                if in_bounds(p, "parallel"):
+                    ads.append((p, float(item["availableAmount"]),
+                                float(item.get("quoteMinAmountPerOrder") or 0),
+                                float(item.get("quoteMaxAmountPerOrder") or 0)))
+            except Exception:
+                pass
+        return ads, len(listed)
+
+    try:
+        return _p2p_depth_price("OKX", page, None)
+    except Exception as e:
+        print(f"[WARN] OKX P2P: {e}")
+        return None
+
+
 def fetch_wise_rate():
     """Wise USD→NGN transfer rate — typically 3–5% below parallel"""
     try:
         url = "https://wise.com/rates/live?source=USD&target=NGN"
-        r = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
+        r = http_client.get(url, timeout=10)
         if r.status_code == 200:
             data = r.json()
             rate = data.get("value") or data.get("rate")
@@ -228,7 +472,7 @@ def fetch_crypto_prices():
     CoinGecko free API — BTC, ETH, BNB only.
     NOTE: Gold is NOT fetched here. CoinGecko's 'gold' ID is a DeFi token
     worth fractions of a cent, not the commodity. Gold spot price comes
-    from fetch_gold_price() via Stooq xauusd symbol.
+    from fetch_gold_price() (ExchangeRate-API XAU, then the market registry).
     """
     try:
         url = "https://api.coingecko.com/api/v3/simple/price"
@@ -237,7 +481,7 @@ def fetch_crypto_prices():
             "vs_currencies": "usd",
             "include_24hr_change": "true"
         }
-        r = requests.get(url, params=params, timeout=12)
+        r = http_client.get(url, params=params, timeout=12)
         r.raise_for_status()
         data = r.json()
         result = {}
@@ -262,56 +506,102 @@ def fetch_crypto_prices():
         return None
 
 
-def fetch_gold_price(gold_from_fx=None):
+def fetch_gold_price(gold_from_fx=None, cache=None):
     """
     Gold spot price (XAU/USD).
     Source priority:
       1. ExchangeRate-API XAU rate (passed in from the FX fetch — same API call, free)
-      2. Stooq xauusd (fallback)
-    Bounds: $1,500–$3,500/oz (gold ATH ~$3,100 as of Feb 2026)
+      2. The SERIES["gold"] chain (fallback): Yahoo GC=F, then Stooq xauusd,
+         gc.f, xau.f
+    Every quote must pass the coarse BOUNDS["gold_usd"] ($500–$15,000/oz) and,
+    with a cache, the anomaly filter.
     """
     # Source 1: ExchangeRate-API (most reliable — already authenticated)
-    if gold_from_fx and 1500 <= gold_from_fx <= 3500:
+    if gold_from_fx and plausible(cache, "gold_usd", gold_from_fx):
         print(f"[INFO] Gold (ExchangeRate-API): ${gold_from_fx:,.2f}/oz")
         return {"gold_usd": gold_from_fx, "gold_chg": None}
 
-    # Source 2: Stooq fallback
-    for sym in ["xauusd", "gc.f", "xau.f"]:
-        val, prev = _stooq_latest_and_prev(sym)
-        if val and 1500 <= val <= 3500:
-            chg = _pct_chg(val, prev)
-            print(f"[INFO] Gold (Stooq {sym}): ${val:,.2f}/oz")
-            return {"gold_usd": round(val, 2), "gold_chg": chg}
-        elif val:
-            print(f"[WARN] Gold Stooq {sym}: {val} rejected (outside 1500-3500)")
-
-    print("[WARN] Gold: all sources failed")
-    return None
+    # Source 2: the "gold" series in the market registry
+    result = fetch_market_groups(cache, ["gold"])["gold"]
+    if not result:
+        print("[WARN] Gold: all sources failed")
+    return result
+
+
+# Per-run Stooq quote cache: symbol → Future holding (latest, prev).
+# The first caller for a symbol downloads it; concurrent callers wait on the
+# same in-flight Future and later callers (retries, gold fallback) read it
+# from memory. Cleared at the start of every fetch stage.
+_quote_cache = {}
+_quote_lock  = threading.Lock()
+
+
+def reset_quote_cache():
+    with _quote_lock:
+        _quote_cache.clear()
 
 
 def _stooq_latest_and_prev(symbol):
     """
-    Fetch latest and previous daily close from Stooq CSV.
+    Latest and previous daily close for a Stooq symbol, memoized per run.
     Returns (latest_close, prev_close) or (None, None).
+    """
+    symbol = symbol.lower()
+    with _quote_lock:
+        fut = _quote_cache.get(symbol)
+        owner = fut is None
+        if owner:
+            fut = Future()
+            _quote_cache[symbol] = fut
+    if owner:
+        try:
+            fut.set_result(_stooq_download(symbol))
+        except BaseException as e:
+            fut.set_exception(e)    # never leave waiters blocked
+            raise
+    return fut.result()
+
+
+def _stooq_rows(symbol, d1=None, d2=None, timeout=10):
+    """
+    Stream (date, close) rows from Stooq's daily CSV without buffering the body.
+    d1/d2 (datetime.date) ask Stooq for a date window instead of full history.
     CSV format: Date,Open,High,Low,Close,Volume
     """
-    try:
-        url = f"https://stooq.com/q/d/l/?s={symbol}&i=d"
-        r = requests.get(url, timeout=10)
-        lines = r.text.strip().split("\n")
-        # Filter out header and empty lines
-        data_lines = [l for l in lines
-                      if l and not l.lower().startswith("date")
-                      and not l.lower().startswith("no data")]
-        if len(data_lines) < 1:
-            return None, None
+    params = {"s": symbol, "i": "d"}
+    if d1:
+        params["d1"] = d1.strftime("%Y%m%d")
+    if d2:
+        params["d2"] = d2.strftime("%Y%m%d")
+    with http_client.get("https://stooq.com/q/d/l/", params=params,
+                         timeout=timeout, stream=True) as r:
+        r.raise_for_status()
+        for raw in r.iter_lines(chunk_size=STOOQ_CHUNK_BYTES):
+            line = raw.decode("utf-8", "ignore") if isinstance(raw, bytes) else raw
+            parts = line.strip().split(",")
+            # Skips the header, "No data" and any malformed line
+            if len(parts) < 5:
+                continue
+            try:
+                yield parts[0], float(parts[4])
+            except ValueError:
+                continue
 
-        def close(line):
-            parts = line.split(",")
-            return float(parts[4]) if len(parts) >= 5 else None
 
-        latest = close(data_lines[-1])
-        prev   = close(data_lines[-2]) if len(data_lines) >= 2 else None
+def _stooq_download(symbol):
+    """
+    Latest and previous daily close from a recent Stooq window.
+    Only a two-row ring buffer is kept while the CSV streams in.
+    Returns (latest_close, prev_close) or (None, None).
+    """
+    try:
+        today = datetime.date.today()
+        tail = deque(_stooq_rows(symbol, d1=today - datetime.timedelta(days=STOOQ_WINDOW_DAYS),
+                                 d2=today), maxlen=2)
+        if not tail:
+            return None, None
+        latest = tail[-1][1]
+        prev   = tail[-2][1] if len(tail) == 2 else None
         return latest, prev
     except Exception as e:
         print(f"[WARN] Stooq {symbol}: {e}")
@@ -324,116 +614,343 @@ def _pct_chg(new, old):
     return None
 
 
-def fetch_oil_prices():
-    """
-    Brent crude: Stooq symbol lcoj.f (ICE Brent front month).
-    Bonny Light = Brent + $1.70 premium (Nigerian crude, not freely quoted).
-    """
-    brent, brent_prev = None, None
-    for brent_sym in ["lcoj.f", "lco.f", "brent.f", "cb.f"]:
-        brent, brent_prev = _stooq_latest_and_prev(brent_sym)
-        if brent and in_bounds(brent, "brent"):
-            print(f"[INFO] Brent ({brent_sym}): ${brent}")
-            break
+# ─── Adaptive symbol router ───────────────────────────────────────────────────
+#
+# Each fallback chain (Brent, indices, commodities, gold) is routed through
+# cache["symbol_router"][key]:
+#   "last_good": symbol that answered last time — always tried first
+#   "stats":     {symbol: {"ok", "fail", "streak", "ms", "last_try"}}
+# A symbol that fails ROUTER_DEMOTE_AFTER runs in a row is demoted: it drops
+# out of the chain and is re-probed at most once every ROUTER_REPROBE_DAYS.
+
+ROUTER_DEMOTE_AFTER = 3
+ROUTER_REPROBE_DAYS = 7
+_router_lock = threading.Lock()
+
+
+def route_symbols(cache, key, symbols):
+    """Order a fallback chain: last good → healthy by hit rate/latency → due probes."""
+    if cache is None:
+        return list(symbols)
+    with _router_lock:
+        entry = cache.get("symbol_router", {}).get(key, {})
+        stats = entry.get("stats", {})
+        last_good = entry.get("last_good")
+        today = datetime.date.today()
+
+        def probe_due(sym):
+            last = stats[sym].get("last_try")
+            if not last:
+                return True
+            age = (today - datetime.date.fromisoformat(last)).days
+            return age >= ROUTER_REPROBE_DAYS
+
+        healthy, demoted = [], []
+        for i, sym in enumerate(symbols):
+            st = stats.get(sym)
+            if st and st.get("streak", 0) >= ROUTER_DEMOTE_AFTER:
+                demoted.append(sym)
+                continue
+            tries = (st or {}).get("ok", 0) + (st or {}).get("fail", 0)
+            hit_rate = (st["ok"] / tries) if tries else 0.5   # unknown = neutral
+            ms = (st or {}).get("ms") or 0
+            healthy.append((sym != last_good, -hit_rate, ms, i, sym))
+        order = [sym for *_, sym in sorted(healthy)]
+
+        due = [sym for sym in demoted if probe_due(sym)]
+        if not order and demoted and not due:
+            # Everything is demoted — still probe the stalest one each run
+            due = [min(demoted, key=lambda s: stats[s].get("last_try", ""))]
+        return order + due
+
+
+def record_symbol(cache, key, symbol, ok, elapsed):
+    """Update a symbol's router stats after one attempt."""
+    if cache is None:
+        return
+    with _router_lock:
+        entry = cache.setdefault("symbol_router", {}).setdefault(key, {})
+        st = entry.setdefault("stats", {}).setdefault(
+            symbol, {"ok": 0, "fail": 0, "streak": 0, "ms": None})
+        ms = round(elapsed * 1000)
+        st["ms"] = ms if st["ms"] is None else round(0.7 * st["ms"] + 0.3 * ms)
+        st["last_try"] = today_str()
+        if ok:
+            st["ok"] += 1
+            st["streak"] = 0
+            entry["last_good"] = symbol
         else:
-            print(f"[WARN] Brent {brent_sym}: {brent}")
-    if not brent or not in_bounds(brent, "brent"):
-        print(f"[WARN] Brent: all symbols failed")
-        return None
-    return {
-        "brent":     round(brent, 2),
-        "brent_chg": _pct_chg(brent, brent_prev),
-        "bonny":     round(brent + 1.7, 2),
-        "bonny_chg": _pct_chg(brent, brent_prev),
-    }
+            st["fail"] += 1
+            st["streak"] += 1
+
+
+# ─── Market series registry ───────────────────────────────────────────────────
+#
+# Every quoted market series is declared once in SERIES:
+#   group   source it belongs to in the freshness schedule / fetched dict
+#   chain   fallback sources in default order; "provider:symbol", where a
+#           bare symbol means Stooq (so router stats keep their old names).
+#           Yahoo comes first: one batch request quotes every series at once,
+#           and Stooq's one-request-per-symbol CSVs are the fallback.
+#   bounds  sanity range (None = unchecked), ttl how long a quote stays fresh
+#   field   output key (default: the series key); the change is "<key>_chg"
+#   derive  (series, premium) — computed from another series, not fetched
+# PROVIDERS maps each provider to its per-symbol "quote" or multi-symbol
+# "batch" function and its per-request cost (Yahoo registers further down).
+# fetch_market_groups() runs any set of groups through one engine, so adding
+# a series is a registry entry, not a new fetch_* function.
+
+HOUR = datetime.timedelta(hours=1)
+
+PROVIDERS = {
+    "stooq": {"quote": _stooq_latest_and_prev, "cost": 1},
+}
+
+SERIES = {
+    # Brent: ICE front month. Bonny Light is not freely quoted; it trades at
+    # roughly a $1.70 premium to Brent.
+    "brent":  {"group": "oil",
+               "chain": ["yahoo:BZ=F", "lcoj.f", "lco.f", "brent.f", "cb.f"],
+               "bounds": BOUNDS["brent"], "ttl": HOUR},
+    "bonny":  {"group": "oil", "derive": ("brent", 1.7), "ttl": HOUR},
+
+    "sp500":  {"group": "global",
+               "chain": ["yahoo:^GSPC", "^spx", "spx.us"], "ttl": HOUR},
+    "ftse":   {"group": "global",
+               "chain": ["yahoo:^FTSE", "^ftse", "ukx.uk", "ftse.uk"], "ttl": HOUR},
+    "dax":    {"group": "global",
+               "chain": ["yahoo:^GDAXI", "^dax", "dax.de"], "ttl": HOUR},
+    "nikkei": {"group": "global",
+               "chain": ["yahoo:^N225", "^nkx", "^n225", "nik.jp"], "ttl": HOUR},
+    "dxy":    {"group": "global",
+               "chain": ["yahoo:DX-Y.NYB", "dx.f", "dxy.f", "usdidx"], "ttl": HOUR},
+
+    # JSE = Johannesburg All Share, EGX = Egyptian Exchange EGX30
+    "jse":    {"group": "african",
+               "chain": ["yahoo:^J203.JO", "^jse", "jse.za", "^jalsh"], "ttl": HOUR},
+    "egx":    {"group": "african",
+               "chain": ["yahoo:^CASE30", "^egx30", "egx30.eg", "^egx"], "ttl": HOUR},
+
+    # cc.f is often unavailable on Stooq, hence the longer cocoa chain
+    "silver": {"group": "commodities",
+               "chain": ["yahoo:SI=F", "xagusd", "xag.f"],
+               "bounds": BOUNDS["silver_usd"], "field": "silver_usd", "ttl": HOUR},
+    "cocoa":  {"group": "commodities",
+               "chain": ["yahoo:CC=F", "cc.f", "cj.f", "cocoa.f"],
+               "bounds": BOUNDS["cocoa_usd"], "field": "cocoa_usd", "ttl": HOUR},
+
+    # Fallback only — fetch_gold_price() prefers the ExchangeRate-API XAU rate
+    "gold":   {"group": "gold",
+               "chain": ["yahoo:GC=F", "xauusd", "gc.f", "xau.f"],
+               "bounds": BOUNDS["gold_usd"], "field": "gold_usd", "ttl": HOUR},
+}
+
+# Groups fetched purely from the registry (gold has its own primary source)
+MARKET_GROUPS = {spec["group"] for spec in SERIES.values()} - {"gold"}
+
+
+def _split_source(source):
+    provider, _, symbol = source.rpartition(":")
+    return provider or "stooq", symbol
 
 
-def fetch_global_indices():
+def _quote_sources(cache, sources):
     """
-    Stooq symbols with fallbacks.
-    Each key tries multiple symbols in order until one works.
+    Quote each "provider:symbol" once, all concurrently.
+    Providers with a "batch" function get one request for all their symbols.
+    Returns ({source: (latest, prev, elapsed_seconds)}, request_cost).
     """
-    # (primary, fallback1, fallback2)
-    symbols = {
-        "sp500":  ["^spx", "spx.us"],
-        "ftse":   ["^ftse", "ukx.uk", "ftse.uk"],
-        "dax":    ["^dax", "dax.de"],
-        "nikkei": ["^nkx", "^n225", "nik.jp"],
-        "dxy":    ["dx.f", "dxy.f", "usdidx"],
-    }
-    results = {}
-    for key, sym_list in symbols.items():
-        for sym in sym_list:
-            val, prev = _stooq_latest_and_prev(sym)
-            if val:
-                results[key]          = round(val, 2)
-                results[f"{key}_chg"] = _pct_chg(val, prev)
-                print(f"[INFO] {key} ({sym}): {val}")
-                break
+    by_provider = {}
+    for source in sources:
+        provider, symbol = _split_source(source)
+        by_provider.setdefault(provider, []).append((source, symbol))
+
+    def timed(fn, *args):
+        def run():
+            started = time.monotonic()
+            out = fn(*args)
+            return out, time.monotonic() - started
+        return run
+
+    tasks, cost = {}, 0
+    for provider, items in by_provider.items():
+        spec = PROVIDERS[provider]
+        if spec.get("batch"):
+            tasks[provider] = timed(spec["batch"], cache, [sym for _, sym in items])
+            cost += spec["cost"]
         else:
-            print(f"[WARN] {key}: all symbols failed {sym_list}")
-    return results
-
-
-def fetch_african_indices():
+            for source, symbol in items:
+                tasks[source] = timed(spec["quote"], symbol)
+                cost += spec["cost"]
+    done = run_parallel(tasks)
+
+    quotes = {}
+    for provider, items in by_provider.items():
+        batch = PROVIDERS[provider].get("batch") and done.get(provider)
+        for source, symbol in items:
+            if PROVIDERS[provider].get("batch"):
+                got, elapsed = batch or ({}, 0.0)
+                val, prev = got.get(symbol, (None, None))
+            else:
+                (val, prev), elapsed = done.get(source) or ((None, None), 0.0)
+            quotes[source] = (val, prev, elapsed)
+    return quotes, cost
+
+
+def fetch_series(cache, keys):
     """
-    African indices with fallback symbols.
-    JSE = Johannesburg Stock Exchange All Share
-    EGX = Egyptian Exchange EGX30
+    Resolve registry series concurrently.
+    Each round quotes the next untried source of every unresolved series in
+    one parallel batch (shared sources are quoted once), then drops failed
+    or out-of-bounds sources and moves on to their fallbacks.
+    Returns {key: (latest, prev)} for the series that resolved.
     """
-    symbols = {
-        "jse": ["^jse", "jse.za", "^jalsh"],
-        "egx": ["^egx30", "egx30.eg", "^egx"],
-    }
-    results = {}
-    for key, sym_list in symbols.items():
-        for sym in sym_list:
-            val, prev = _stooq_latest_and_prev(sym)
-            if val:
-                results[key]          = round(val, 2)
-                results[f"{key}_chg"] = _pct_chg(val, prev)
-                print(f"[INFO] {key} ({sym}): {val}")
-                break
+    started = time.monotonic()
+    # Batch sources go first whatever the router says — one request serves
+    # every series that asks for them, so they are nearly free to try.
+    def batch_first(source):
+        return not PROVIDERS[_split_source(source)[0]].get("batch")
+
+    pending = {key: sorted(route_symbols(cache, key, SERIES[key]["chain"]),
+                           key=batch_first)
+               for key in keys if "chain" in SERIES[key]}
+    seen, resolved, rounds, cost = {}, {}, 0, 0
+    while pending:
+        rounds += 1
+        wanted = {key: chain[0] for key, chain in pending.items()}
+        quotes, spent = _quote_sources(cache, sorted(set(wanted.values()) - set(seen)))
+        seen.update(quotes)
+        cost += spent
+        for key, source in wanted.items():
+            val, prev, elapsed = seen[source]
+            lo, hi = SERIES[key].get("bounds") or (None, None)
+            answered = bool(val) and (lo is None or lo <= val <= hi)
+            record_symbol(cache, key, source, answered, elapsed)
+            field = SERIES[key].get("field", key)
+            if answered and (cache is None or anomaly.screen(cache, field, val)):
+                print(f"[INFO] {key} ({source}): {val}")
+                resolved[key] = (val, prev)
+                del pending[key]
+                continue
+            if val and not answered:
+                print(f"[WARN] {key} ({source}): {val} outside bounds {lo}-{hi}")
+            pending[key].pop(0)
+            if not pending[key]:
+                print(f"[WARN] {key}: all symbols failed {SERIES[key]['chain']}")
+                del pending[key]
+
+    for key in keys:
+        base, premium = SERIES[key].get("derive") or (None, 0)
+        if base in resolved:
+            val, prev = resolved[base]
+            resolved[key] = (val + premium, prev + premium if prev else prev)
+
+    print(f"[INFO] Series engine: {len(resolved)}/{len(keys)} series in "
+          f"{rounds} round(s), {len(seen)} quotes in {cost} request(s) "
+          f"in {time.monotonic() - started:.1f}s")
+    return resolved
+
+
+def fetch_market_groups(cache, groups):
+    """
+    Fetch every series of the given groups in one engine run.
+    Returns {group: {field: value, "<key>_chg": pct}} — None for a group
+    where nothing resolved.
+    """
+    keys = [key for key, spec in SERIES.items() if spec["group"] in groups]
+    for key in keys:
+        base = (SERIES[key].get("derive") or (None,))[0]
+        if base and base not in keys:
+            keys.append(base)
+    resolved = fetch_series(cache, keys)
+    results = {group: {} for group in groups}
+    for key, (val, prev) in resolved.items():
+        spec = SERIES[key]
+        if spec["group"] not in results:
+            continue
+        results[spec["group"]][spec.get("field", key)] = round(val, 2)
+        if spec.get("derive"):
+            prev_base = resolved[spec["derive"][0]]
+            results[spec["group"]][f"{key}_chg"] = _pct_chg(*prev_base)
         else:
-            print(f"[WARN] {key}: all symbols failed {sym_list}")
-    return results
+            results[spec["group"]][f"{key}_chg"] = _pct_chg(val, prev)
+    return {group: result or None for group, result in results.items()}
+
+
+# ─── P2P consensus ────────────────────────────────────────────────────────────
+#
+# Every P2P venue is queried at once under one deadline. As soon as
+# P2P_QUORUM venues have answered, the rest are dropped and the parallel rate
+# is their median, so the step waits for the quorum, not the slowest venue:
+# any two of the three venues make a rate.
+# Wise is a remittance rate (typically 3–5% below P2P), so it stays its own
+# source instead of voting here.
+
+P2P_VENUES = {
+    "binance": fetch_binance_p2p,
+    "bybit":   fetch_bybit_p2p,
+    "okx":     fetch_okx_p2p,
+}
+P2P_QUORUM   = 2
+P2P_DEADLINE = 15
 
 
-def fetch_commodities():
+def fetch_p2p_consensus():
     """
-    Stooq: xagusd=Silver spot (USD/oz)
-    Cocoa: tries multiple symbols (cc.f often unavailable on Stooq)
+    Returns {"venues": {name: price}, "median": price, "quorum": bool},
+    or None if no venue answered. quorum=False means the deadline passed
+    with fewer than P2P_QUORUM answers and the median is from what arrived.
     """
-    symbols = {"silver": ["xagusd", "xag.f"], "cocoa": ["cc.f", "cj.f", "cocoa.f"]}
-    # Bounds for commodity sanity checks
-    COMM_BOUNDS = {
-        "silver": (10,   100),    # Silver ~$20-50/oz
-        "cocoa":  (2000, 20000),  # Cocoa ~$5k-12k/ton
-    }
-    results = {}
-    for key, sym_list in symbols.items():
-        if isinstance(sym_list, str): sym_list = [sym_list]
-        lo, hi = COMM_BOUNDS.get(key, (0, 999999))
-        for sym in sym_list:
-            val, prev = _stooq_latest_and_prev(sym)
-            if val and lo <= val <= hi:
-                results[f"{key}_usd"] = round(val, 2)
-                results[f"{key}_chg"] = _pct_chg(val, prev)
-                print(f"[INFO] {key} ({sym}): {val}")
-                break
-            elif val:
-                print(f"[WARN] {key} ({sym}): {val} outside bounds {lo}-{hi}")
-        else:
-            print(f"[WARN] {key}: all symbols failed or out of bounds")
-    return results
+    quotes = run_parallel(P2P_VENUES, deadline=P2P_DEADLINE,
+                          quorum=min(P2P_QUORUM, len(P2P_VENUES)))
+    venues = {name: price for name, price in quotes.items() if price}
+    if not venues:
+        print("[WARN] P2P consensus: no venue answered")
+        return None
+    median = round(statistics.median(venues.values()), 0)
+    reached = len(venues) >= min(P2P_QUORUM, len(P2P_VENUES))
+    print(f"[INFO] P2P consensus: median ₦{median:.0f} from {sorted(venues)}"
+          f"{'' if reached else ' (below quorum)'}")
+    return {"venues": venues, "median": median, "quorum": reached}
 
 
+
+def fetch_parallel_rate():
+    """
+    P2P rate for the posting run. When the resident sampler (p2p_sampler.py)
+    has a fresh ring buffer, its time-weighted average and intraday hi/lo are
+    used and no venue is called; otherwise falls back to a live consensus.
+    """
+    sampled = p2p_sampler.read_summary(list(P2P_VENUES))
+    if not sampled:
+        return fetch_p2p_consensus()
+    print(f"[INFO] P2P sampler: TWAP ₦{sampled['twap']:.0f} over "
+          f"{sampled['samples']} samples (last {sampled['age']}s ago)")
+    return {"venues": sampled["venues"], "median": sampled["twap"],
+            "quorum": True, "hi": sampled["hi"], "lo": sampled["lo"]}
+
 # ─── Tier 2: Daily scrapes ─────────────────────────────────────────────────────
 
+def _parse_fuel_page(text, pattern):
+    result = {}
+    m_petrol = re.search(pattern, text, re.IGNORECASE)
+    m_diesel = re.search(r'(?:diesel|ago)[^\d]{0,30}?(\d{3,4})', text, re.IGNORECASE)
+    if m_petrol:
+        v = int(m_petrol.group(1))
+        if in_bounds(v, "petrol"):
+            result["petrol"] = v
+    if m_diesel:
+        v = int(m_diesel.group(1))
+        if in_bounds(v, "diesel"):
+            result["diesel"] = v
+    return result
+
+
 def fetch_fuel_prices(cache):
     """
     Scrape petrol/diesel prices from Nairametrics then Pricecheck as fallback.
     Sanity check: petrol ₦400–5000/L, diesel ₦400–8000/L.
+    Pages go through http_cache, so an unchanged page is not re-downloaded.
     """
     sources = [
         ("https://nairametrics.com/category/oil-gas/downstream/",
@@ -443,19 +960,8 @@ def fetch_fuel_prices(cache):
     ]
     for url, pattern, name in sources:
         try:
-            r = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
-            text = r.text
-            result = {}
-            m_petrol = re.search(pattern, text, re.IGNORECASE)
-            m_diesel = re.search(r'(?:diesel|ago)[^\d]{0,30}?(\d{3,4})', text, re.IGNORECASE)
-            if m_petrol:
-                v = int(m_petrol.group(1))
-                if in_bounds(v, "petrol"):
-                    result["petrol"] = v
-            if m_diesel:
-                v = int(m_diesel.group(1))
-                if in_bounds(v, "diesel"):
-                    result["diesel"] = v
+            result = http_cache.get_parsed(
+                url, lambda text: _parse_fuel_page(text, pattern), timeout=15)
             if result:
                 print(f"[INFO] Fuel from {name}: {result}")
                 return result
@@ -464,27 +970,170 @@ def fetch_fuel_prices(cache):
     return None
 
 
+def _parse_reserves_page(text):
+    m = re.search(r'\$([\d,\.]+)\s*(?:billion|bn)', text, re.IGNORECASE)
+    if m:
+        val = float(m.group(1).replace(",", ""))
+        if 5 <= val <= 100:
+            return val
+    return None
+
+
 def fetch_fx_reserves(cache):
-    """CBN FX reserves. Sanity: $5B–$100B."""
+    """CBN FX reserves. Sanity: $5B–$100B. Conditional GET via http_cache."""
     try:
-        r = requests.get("https://www.cbn.gov.ng/IntOps/ExtReserves.asp",
-                         headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
-        m = re.search(r'\$([\d,\.]+)\s*(?:billion|bn)', r.text, re.IGNORECASE)
-        if m:
-            val = float(m.group(1).replace(",", ""))
-            if 5 <= val <= 100:
-                return val
-        return None
+        return http_cache.get_parsed("https://www.cbn.gov.ng/IntOps/ExtReserves.asp",
+                                     _parse_reserves_page, timeout=15)
     except Exception as e:
         print(f"[WARN] FX reserves: {e}")
         return None
 
 
+# ─── Yahoo Finance session ────────────────────────────────────────────────────
+#
+# Yahoo wants a session cookie plus a crumb token on its quote endpoints.
+# Both are kept in cache["yahoo_session"] and reused across runs until the TTL
+# runs out or Yahoo rejects them (401/403), which triggers one refresh.
+# The refresh is single-flight: the first rejected caller logs in again and
+# everyone else picks up its session, at most once per run. A login that
+# gets no crumb is remembered, so later calls go on without one rather than
+# queueing for another login.
+
+YAHOO_SESSION_TTL_HOURS = 24
+
+# Wall-clock budget for the per-ticker chart fallback in fetch_ngx_movers
+NGX_CHART_DEADLINE = 12
+
+YAHOO_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://finance.yahoo.com/",
+    "Origin": "https://finance.yahoo.com",
+}
+
+_yahoo_lock = threading.Lock()
+# This process's live session; "refreshed" / "login_failed" hold for the run
+_yahoo = {"session": None, "crumb": None, "refreshed": False, "login_failed": False}
+
+
+def _yahoo_login(session):
+    """Visit Yahoo for cookies, then fetch a crumb. Returns crumb or None."""
+    session.get("https://finance.yahoo.com", timeout=10)
+    crumb_r = session.get("https://query1.finance.yahoo.com/v1/test/getcrumb", timeout=10)
+    print(f"[DEBUG] Yahoo crumb: {crumb_r.status_code}")
+    if crumb_r.status_code == 200 and crumb_r.text.strip():
+        return crumb_r.text.strip()
+    return None
+
+
+def yahoo_session(cache, rejected=None):
+    """
+    (session, crumb) for Yahoo Finance, reusing the stored cookie jar and
+    crumb while they are younger than YAHOO_SESSION_TTL_HOURS.
+    rejected: a session Yahoo just answered 401/403 — logs in again unless
+    another caller already has, this run has refreshed once, or a login
+    already failed. With cache=None the session is kept for this process only.
+    """
+    with _yahoo_lock:
+        current = _yahoo["session"]
+        if current and (rejected is not current or _yahoo["refreshed"]
+                        or _yahoo["login_failed"]):
+            return current, _yahoo["crumb"]
+        refresh = rejected is not None
+
+        session = http_client.new_session(YAHOO_HEADERS)
+        stored  = cache.get("yahoo_session", {}) if cache is not None else {}
+        age_h   = None
+        if stored.get("fetched"):
+            age = datetime.datetime.now() - datetime.datetime.fromisoformat(stored["fetched"])
+            age_h = age.total_seconds() / 3600
+
+        if not refresh and stored.get("crumb") and age_h is not None \
+                and age_h < YAHOO_SESSION_TTL_HOURS:
+            for c in stored.get("cookies", []):
+                session.cookies.set(c["name"], c["value"],
+                                    domain=c.get("domain", ""), path=c.get("path", "/"))
+            crumb = stored["crumb"]
+            print(f"[DEBUG] Yahoo session reused ({age_h:.1f}h old)")
+        else:
+            crumb = _yahoo_login(session)
+            if crumb:
+                if cache is not None:
+                    cache["yahoo_session"] = {
+                        "crumb":   crumb,
+                        "fetched": datetime.datetime.now().isoformat(timespec="seconds"),
+                        "cookies": [{"name": c.name, "value": c.value,
+                                     "domain": c.domain, "path": c.path}
+                                    for c in session.cookies],
+                    }
+                print(f"[DEBUG] Yahoo crumb obtained: {crumb[:20]}...")
+            else:
+                if cache is not None:
+                    cache.pop("yahoo_session", None)
+                _yahoo["login_failed"] = True
+                print("[WARN] Yahoo login got no crumb — continuing without one this run")
+
+        _yahoo["session"], _yahoo["crumb"] = session, crumb
+        _yahoo["refreshed"] |= refresh
+        return session, crumb
+
+
+def yahoo_get(cache, url, params=None, timeout=15, crumb=True):
+    """
+    GET a Yahoo Finance API URL with the shared session (and crumb when
+    crumb=True). A 401/403 retries once if yahoo_session() hands back a
+    fresher session than the one rejected.
+    """
+    session, token = yahoo_session(cache)
+    for attempt in range(2):
+        p = dict(params or {})
+        if crumb and token:
+            p["crumb"] = token
+        r = session.get(url, params=p, timeout=timeout)
+        if r.status_code not in (401, 403) or attempt:
+            return r
+        fresh, token = yahoo_session(cache, rejected=session)
+        if fresh is session:
+            return r
+        print(f"[DEBUG] Yahoo {r.status_code} — retrying with a refreshed session")
+        session = fresh
+    return r
+
+
+def yahoo_quotes(cache, symbols):
+    """
+    Latest price and previous close for many symbols in one v7 quote request.
+    Returns {symbol: (price, prev_close)} for the symbols Yahoo answered;
+    {} if the request failed (callers fall back per symbol).
+    """
+    for base in ["query1", "query2"]:
+        r = yahoo_get(cache, f"https://{base}.finance.yahoo.com/v7/finance/quote",
+                      params={"symbols": ",".join(symbols)})
+        if r.status_code == 200:
+            break
+        print(f"[DEBUG] Yahoo v7 ({base}) batch: {r.status_code}")
+    else:
+        return {}
+    quotes = {}
+    for item in r.json().get("quoteResponse", {}).get("result", []):
+        price = item.get("regularMarketPrice")
+        if item.get("symbol") in symbols and price:
+            quotes[item["symbol"]] = (float(price),
+                                      item.get("regularMarketPreviousClose"))
+    print(f"[DEBUG] Yahoo batch: {len(quotes)}/{len(symbols)} symbols quoted")
+    return quotes
+
+
+PROVIDERS["yahoo"] = {"batch": yahoo_quotes, "cost": 1}
+
+
 def fetch_ngx_movers(cache):
     """
-    NGX top movers via Yahoo Finance with proper session/crumb auth.
-    Yahoo Finance requires a crumb token since 2023 — we get it via
-    a session cookie from visiting their site first.
+    NGX top movers via Yahoo Finance with session/crumb auth
+    (see yahoo_session — cookie and crumb are reused across runs).
     Falls back to chart API per-ticker if batch quote fails.
     """
     TICKERS = [
@@ -495,16 +1144,6 @@ def fetch_ngx_movers(cache):
         "STANBIC.LG", "FIDELITYBK.LG", "UCAP.LG", "CADBURY.LG",
     ]
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                      "AppleWebKit/537.36 (KHTML, like Gecko) "
-                      "Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "application/json, text/plain, */*",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": "https://finance.yahoo.com/",
-        "Origin": "https://finance.yahoo.com",
-    }
-
     def parse_movers(result_list):
         movers = []
         for item in result_list:
@@ -521,30 +1160,13 @@ def fetch_ngx_movers(cache):
 
     symbols_str = ",".join(TICKERS)
 
-    # ── Method 1: Session + crumb (Yahoo's standard auth since 2023) ──────────
+    # ── Method 1: Batch quote with crumb (Yahoo's standard auth since 2023) ───
     try:
-        session = requests.Session()
-        session.headers.update(headers)
-
-        # Get cookies by visiting Yahoo Finance
-        session.get("https://finance.yahoo.com", timeout=10)
-
-        # Get crumb token
-        crumb_r = session.get(
-            "https://query1.finance.yahoo.com/v1/test/getcrumb",
-            timeout=10
-        )
-        print(f"[DEBUG] Yahoo crumb: {crumb_r.status_code}")
-
-        if crumb_r.status_code == 200:
-            crumb = crumb_r.text.strip()
-            print(f"[DEBUG] Yahoo crumb obtained: {crumb[:20]}...")
-
-            # Batch quote with crumb
+        _, crumb = yahoo_session(cache)
+        if crumb:
             for base in ["query1", "query2"]:
-                url = (f"https://{base}.finance.yahoo.com/v7/finance/quote"
-                       f"?symbols={symbols_str}&crumb={crumb}")
-                r = session.get(url, timeout=15)
+                r = yahoo_get(cache, f"https://{base}.finance.yahoo.com/v7/finance/quote",
+                              params={"symbols": symbols_str})
                 print(f"[DEBUG] Yahoo v7 ({base}) with crumb: {r.status_code}")
                 if r.status_code == 200:
                     result = r.json().get("quoteResponse", {}).get("result", [])
@@ -561,32 +1183,31 @@ def fetch_ngx_movers(cache):
     except Exception as e:
         print(f"[DEBUG] Yahoo session/crumb: {e}")
 
-    # ── Method 2: Per-ticker chart API (no crumb needed) ─────────────────────
+    # ── Method 2: Per-ticker chart API (no crumb needed, same session) ───────
+    # All tickers at once under one deadline; whatever answered in time ranks.
+    def chart_change(ticker):
+        r = yahoo_get(cache, f"https://query2.finance.yahoo.com/v8/finance/chart/{ticker}",
+                      params={"interval": "1d", "range": "5d"}, timeout=8, crumb=False)
+        if r.status_code != 200:
+            print(f"[DEBUG] {ticker}: {r.status_code}")
+            return None
+        meta = r.json().get("chart", {}).get("result", [{}])[0].get("meta", {})
+        price = meta.get("regularMarketPrice")
+        prev  = meta.get("previousClose") or meta.get("chartPreviousClose")
+        if price and prev and prev > 0:
+            return round(((price - prev) / prev) * 100, 2)
+        return None
+
     try:
+        changes = run_parallel({t: (lambda t=t: chart_change(t)) for t in TICKERS},
+                               deadline=NGX_CHART_DEADLINE)
         movers = []
-        session2 = requests.Session()
-        session2.headers.update(headers)
-        session2.get("https://finance.yahoo.com", timeout=8)
-
-        for ticker in TICKERS[:10]:
-            try:
-                url = (f"https://query2.finance.yahoo.com/v8/finance/chart/{ticker}"
-                       f"?interval=1d&range=5d")
-                r = session2.get(url, timeout=8)
-                if r.status_code != 200:
-                    print(f"[DEBUG] {ticker}: {r.status_code}")
-                    continue
-                meta = r.json().get("chart", {}).get("result", [{}])[0].get("meta", {})
-                price = meta.get("regularMarketPrice")
-                prev  = meta.get("previousClose") or meta.get("chartPreviousClose")
-                sym   = ticker.replace(".LG", "")
-                if price and prev and prev > 0:
-                    chg = round(((price - prev) / prev) * 100, 2)
-                    if 0.01 <= abs(chg) <= 15:
-                        movers.append({"name": sym, "change": chg})
-                        print(f"[DEBUG] {sym}: {chg:+.2f}%")
-            except Exception:
-                pass
+        for ticker in TICKERS:
+            chg = changes.get(ticker)
+            if chg is not None and 0.01 <= abs(chg) <= 15:
+                movers.append({"name": ticker.replace(".LG", ""), "change": chg})
+        answered = sum(1 for v in changes.values() if v is not None)
+        print(f"[DEBUG] Chart fallback: {answered}/{len(TICKERS)} tickers answered")
 
         if len(movers) >= 2:
             movers.sort(key=lambda x: abs(x["change"]), reverse=True)
@@ -602,8 +1223,6 @@ def fetch_ngx_movers(cache):
     return None
 
 
-
-
 # ─── Aza Index ────────────────────────────────────────────────────────────────
 
 def calculate_aza_index(data):
@@ -744,43 +1363,311 @@ def calculate_aza_index(data):
     }
 
 
+# ─── Local price history ──────────────────────────────────────────────────────
+#
+# history_store keeps one close per series per day. Once a day the first
+# posting run tops it up: a series missing at most HISTORY_TOPUP_DAYS only
+# asks Stooq for the days after its newest row, a small request that fits the
+# fetch stage. Empty series (HISTORY_BACKFILL_YEARS of closes) and longer gaps
+# are left to `python fetcher.py --backfill-history`, a separate post.yml step
+# after posting, so the long pulls are never on the posting path.
+# Registry series use the router's last good Stooq symbol.
+
+HISTORY_BACKFILL_YEARS   = 5
+HISTORY_TOPUP_DAYS       = 31
+HISTORY_TOPUP_TIMEOUT    = 10   # seconds per Stooq request
+HISTORY_BACKFILL_TIMEOUT = 30
+
+# Stooq series kept in history that are not quoted through the registry
+HISTORY_EXTRA = {
+    "usdngn": "usdngn",
+    "eurusd": "eurusd",
+    "gbpusd": "gbpusd",
+}
+
+
+def _history_symbol(cache, key):
+    chain = [s for s in SERIES[key]["chain"] if _split_source(s)[0] == "stooq"]
+    last_good = (cache or {}).get("symbol_router", {}).get(key, {}).get("last_good")
+    return last_good if last_good in chain else (chain[0] if chain else None)
+
+
+def history_sync_plan(cache, backfill=False):
+    """
+    {series: (stooq_symbol, d1)}, d1 being the first missing day (the backfill
+    start for an empty series). backfill=False: the posting run's once-a-day
+    top-ups of series missing at most HISTORY_TOPUP_DAYS. backfill=True: every
+    other series, for backfill_history().
+    """
+    if not backfill and history_store.get_meta("synced") == today_str():
+        return {}
+    symbols = {key: _history_symbol(cache, key) for key, spec in SERIES.items()
+               if "chain" in spec}
+    symbols.update(HISTORY_EXTRA)
+    today = datetime.date.today()
+    start = today - datetime.timedelta(days=365 * HISTORY_BACKFILL_YEARS)
+    topup_from = today - datetime.timedelta(days=HISTORY_TOPUP_DAYS)
+    plan = {}
+    for series, symbol in symbols.items():
+        last = history_store.latest_day(series)
+        d1 = last + datetime.timedelta(days=1) if last else start
+        if symbol and d1 <= today and (d1 < topup_from) == backfill:
+            plan[series] = (symbol, d1)
+    return plan
+
+
+def fetch_history(plan, timeout=HISTORY_TOPUP_TIMEOUT):
+    """Download the missing rows of a sync plan concurrently. {series: rows}"""
+    today = datetime.date.today()
+
+    def pull(symbol, d1):
+        return list(_stooq_rows(symbol, d1=d1, d2=today, timeout=timeout))
+
+    return run_parallel({series: (lambda s=symbol, d=d1: pull(s, d))
+                         for series, (symbol, d1) in plan.items()})
+
+
+def store_history(pulled, mark_synced=True):
+    """Write fetched rows; the day counts as synced unless every pull failed."""
+    added = sum(history_store.upsert(series, rows)
+                for series, rows in pulled.items() if rows)
+    if mark_synced and any(rows is not None for rows in pulled.values()):
+        history_store.set_meta("synced", today_str())
+    print(f"[INFO] History sync: {added} rows across {len(pulled)} series")
+
+
+def backfill_history():
+    """
+    Pull the empty and long-stale series (see history_sync_plan). Run as its
+    own post.yml step after posting: `python fetcher.py --backfill-history`.
+    """
+    plan = history_sync_plan(load_cache(), backfill=True)
+    if not plan:
+        print("[INFO] History backfill: nothing to backfill")
+        return
+    print(f"[INFO] History backfill: {sorted(plan)}")
+    store_history(fetch_history(plan, timeout=HISTORY_BACKFILL_TIMEOUT),
+                  mark_synced=False)
+
+
+def rolling_window(cache, name, now):
+    """
+    Load a rolling window; one that has never been saved is seeded from the
+    history store's daily values up to yesterday.
+    """
+    ts = now.timestamp()
+    window = rolling.load(cache, name, ts)
+    if name not in cache.get("rolling", {}):
+        series = rolling.WINDOWS[name][0]
+        start = rolling.wat_date(rolling.window_start(window.span, ts))
+        yesterday = rolling.wat_date(ts) - datetime.timedelta(days=1)
+        for day, value in history_store.rows(series, start, yesterday):
+            window.push(value, rolling.day_start(datetime.date.fromisoformat(day)))
+    return window
+
+
+# ─── Freshness schedule ───────────────────────────────────────────────────────
+#
+# Each source declares how long its last good result stays fresh. A run only
+# fetches stale sources; fresh ones are served from cache["source_results"],
+# with the fetch time in cache["fetched_at"]. Daily sources use 20h, not 24h,
+# so the next morning's run still qualifies despite cron jitter.
+# Tier 3/4 fields (inflation, unemployment, …) are edited by hand in cache.json
+# and have no fetcher, so they are not scheduled here.
+
+def _with_group_ttls(ttls):
+    """ttls plus each market group at the shortest TTL any of its series declares."""
+    ttls = dict(ttls)
+    for s in SERIES.values():
+        if s["group"] != "gold":
+            ttls[s["group"]] = min(s["ttl"], ttls.get(s["group"], s["ttl"]))
+    return ttls
+
+
+FRESHNESS_TTL = _with_group_ttls({
+    "fx":          datetime.timedelta(hours=1),
+    "gold":        datetime.timedelta(hours=1),
+    "p2p":         datetime.timedelta(minutes=10),
+    "wise":        datetime.timedelta(hours=1),
+    "crypto":      datetime.timedelta(minutes=10),
+    "ngx_movers":  datetime.timedelta(minutes=30),
+    "fuel":        datetime.timedelta(hours=20),
+    "reserves":    datetime.timedelta(hours=20),
+})
+
+# A source is also stale whenever the source it is derived from is stale
+FRESHNESS_DEPENDS = {"gold": "fx"}
+
+
+def plan_refresh(cache, now=None):
+    """Return (stale, fresh) sets of source names."""
+    now = now or datetime.datetime.now()
+    fetched_at = cache.get("fetched_at", {})
+    results    = cache.get("source_results", {})
+    stale = set()
+    for source, ttl in FRESHNESS_TTL.items():
+        ts = fetched_at.get(source)
+        if source not in results or not ts \
+                or now - datetime.datetime.fromisoformat(ts) >= ttl:
+            stale.add(source)
+    for source, parent in FRESHNESS_DEPENDS.items():
+        if parent in stale:
+            stale.add(source)
+    fresh = set(FRESHNESS_TTL) - stale
+    print(f"[INFO] Refresh plan: {len(stale)} stale, {len(fresh)} fresh "
+          f"({', '.join(sorted(fresh)) or 'none'})")
+    return stale, fresh
+
+
+def remember_results(cache, live, now=None):
+    """Store each successful live result with its fetch time."""
+    now = (now or datetime.datetime.now()).isoformat(timespec="seconds")
+    for source, result in live.items():
+        if source in FRESHNESS_TTL and result:
+            cache.setdefault("source_results", {})[source] = result
+            cache.setdefault("fetched_at", {})[source] = now
+
+
+# ─── Concurrent fetch stage ───────────────────────────────────────────────────
+
+def _fetch_fx_then_gold(api_key, cache):
+    """Gold prefers the XAU rate from the FX response, so it runs after FX."""
+    fx = fetch_exchange_rates(api_key)
+    gold = fetch_gold_price(fx.get("gold_usd_fx") if fx else None, cache)
+    return fx, gold
+
+
+# Live values judged by the anomaly filter before they are used or cached:
+# source → {field: series}. "" means the result itself is the value.
+# Registry series and gold are screened where they are fetched.
+SCREENED_FIELDS = {
+    "fx":     {"ngn": "cbn"},
+    "p2p":    {"median": "parallel"},
+    "wise":   {"": "wise"},
+    "crypto": {"btc_usd": "btc_usd", "eth_usd": "eth_usd",
+               "bnb_usd": "bnb_usd", "sol_usd": "sol_usd"},
+    "fuel":   {"petrol": "petrol", "diesel": "diesel"},
+}
+
+# Dropping one of these fields invalidates the whole source result
+SCREEN_REQUIRED = {("fx", "ngn"), ("p2p", "median")}
+
+
+def screen_live(cache, live):
+    """Drop live values the anomaly filter rejects (in place)."""
+    for source, fields in SCREENED_FIELDS.items():
+        result = live.get(source)
+        if not result:
+            continue
+        if "" in fields:
+            if not plausible(cache, fields[""], result):
+                live[source] = None
+            continue
+        for field, series in fields.items():
+            if field in result and not plausible(cache, series, result[field]):
+                if (source, field) in SCREEN_REQUIRED:
+                    live[source] = None
+                    break
+                result = {k: v for k, v in result.items()
+                          if k != field and k != field.replace("_usd", "_chg")}
+                live[source] = result or None
+
+
+def fetch_sources(config, cache, stale):
+    """
+    Fetch the stale network sources concurrently. Wall-clock time is close to
+    the slowest single source (or the FX → gold chain) rather than the sum.
+    Returns {source: result}; failed sources map to None and sources skipped
+    by an open breaker are absent.
+    """
+    api_key = config.get("EXCHANGERATE_API_KEY", "")
+    candidates = {
+        "p2p":         fetch_parallel_rate,
+        "crypto":      fetch_crypto_prices,
+    }
+    markets = sorted(MARKET_GROUPS & set(stale))
+    if markets:
+        candidates["markets"] = lambda: fetch_market_groups(cache, markets)
+    if "fx" in stale:
+        candidates["fx_gold"] = lambda: _fetch_fx_then_gold(api_key, cache)
+    else:
+        fx = cache.get("source_results", {}).get("fx") or {}
+        candidates["gold"] = lambda: fetch_gold_price(fx.get("gold_usd_fx"), cache)
+    tasks = {name: fn for name, fn in candidates.items()
+             if name in stale or name in ("fx_gold", "markets")}
+
+    # Sources behind a circuit breaker are left out entirely while it is open
+    guarded = {
+        "wise":       fetch_wise_rate,
+        "ngx_movers": lambda: fetch_ngx_movers(cache),
+        "fuel":       lambda: fetch_fuel_prices(cache),
+        "reserves":   lambda: fetch_fx_reserves(cache),
+    }
+    for source, fn in guarded.items():
+        if source in stale and breaker_allows(cache, source):
+            tasks[source] = fn
+
+    plan = history_sync_plan(cache)
+    if plan:
+        tasks["history"] = lambda: fetch_history(plan)
+
+    print(f"[INFO] Fetching {len(tasks)} sources concurrently "
+          f"({FETCH_WORKERS} workers)...")
+    http_client.reset_stats()
+    reset_quote_cache()
+    anomaly.start_run()
+    started = time.monotonic()
+    results = run_parallel(tasks)
+    net = http_client.stats()
+    print(f"[INFO] Fetch stage done in {time.monotonic() - started:.1f}s — "
+          f"{net['requests']} requests, {net['connections']} new connections, "
+          f"{net['reused']} reused")
+
+    if "fx_gold" in results:
+        results["fx"], results["gold"] = results.pop("fx_gold") or (None, None)
+    if "markets" in results:
+        results.update(results.pop("markets") or dict.fromkeys(markets))
+    if "history" in results:
+        store_history(results.pop("history") or {})
+    return results
+
+
 # ─── Master fetch ──────────────────────────────────────────────────────────────
 
 def fetch_all_data(config):
     """Fetch all data. Returns (data_dict, alerts_list)."""
     cache = load_cache()
     now   = datetime.datetime.now()
-    is_first_run_today = now.hour < 9
-    is_monday          = now.weekday() == 0
     data   = {}
     alerts = []
 
+    # Only stale sources hit the network; fresh ones come from the cache.
+    # `live` holds this run's network results, `fetched` adds the fresh ones.
+    stale, fresh = plan_refresh(cache, now)
+    live = fetch_sources(config, cache, stale)
+    screen_live(cache, live)
+    remember_results(cache, live, now)
+    stored  = cache.get("source_results", {})
+    fetched = {source: stored.get(source) for source in fresh}
+    fetched.update(live)
+    fetched.setdefault("fx", None)
+    fetched.setdefault("gold", None)
+
     # ── Exchange rates ─────────────────────────────────────────────────────────
-    print("[INFO] Fetching exchange rates...")
-    fx = fetch_exchange_rates(config.get("EXCHANGERATE_API_KEY", ""))
+    # NGN crosses come from this run's FX response, or the last good one
+    # (source_results) if the FX API failed.
+    fx = fetched["fx"]
     if fx and fx.get("ngn"):
         ngn = fx["ngn"]
-        data["cbn"]     = round(ngn, 2)
-        data["eur_ngn"] = fx.get("eur_ngn") or round(ngn / 0.92, 0)
-        data["gbp_ngn"] = fx.get("gbp_ngn") or round(ngn * 1.27, 0)
-        data["cny_ngn"] = fx.get("cny_ngn") or round(ngn * 0.137, 0)
-        data["kes_ngn"] = fx.get("kes_ngn") or round(ngn * 0.0077, 2)
-        data["ghs_ngn"] = fx.get("ghs_ngn") or round(ngn * 0.064, 2)
-        data["zar_ngn"] = fx.get("zar_ngn") or round(ngn * 0.053, 2)
-        data["egp_ngn"] = fx.get("egp_ngn") or round(ngn * 0.020, 2)
-        data["xof_ngn"] = fx.get("xof_ngn") or round(ngn * 0.0015, 3)
+        data["cbn"] = round(ngn, 2)
         print(f"[INFO] CBN rate: ₦{ngn:,.0f}/USD")
     else:
         print("[WARN] Exchange rate API failed — using cache")
-        data["cbn"]     = cache.get("last_cbn",     1590)
-        data["eur_ngn"] = cache.get("last_eur_ngn", 1730)
-        data["gbp_ngn"] = cache.get("last_gbp_ngn", 2020)
-        data["cny_ngn"] = cache.get("last_cny_ngn",  218)
-        data["kes_ngn"] = cache.get("last_kes_ngn",  12.3)
-        data["ghs_ngn"] = cache.get("last_ghs_ngn",  102)
-        data["zar_ngn"] = cache.get("last_zar_ngn",   84)
-        data["egp_ngn"] = cache.get("last_egp_ngn",   32)
-        data["xof_ngn"] = cache.get("last_xof_ngn",  2.5)
+        data["cbn"] = cache.get("last_cbn", snapshot.FALLBACKS["cbn"])
+    last_fx = fx or cache.get("source_results", {}).get("fx") or {}
+    for code in fx_matrix.NGN_CROSSES:
+        key = f"{code.lower()}_ngn"
+        data[key] = last_fx.get(key) or cache.get(f"last_{key}", snapshot.FALLBACKS[key])
 
     # African currency daily changes (tracked across runs via cache)
     for cur in ["kes", "ghs", "zar", "egp", "xof"]:
@@ -791,25 +1678,17 @@ def fetch_all_data(config):
                              if (prev and curr and prev > 0) else 0.0
         cache[f"prev_{key}"] = curr
 
-    # ── P2P / Parallel rate ────────────────────────────────────────────────────
-    print("[INFO] Fetching P2P rates...")
-    binance_rate = fetch_binance_p2p()
-    bybit_rate   = fetch_bybit_p2p()
-
-    if binance_rate and bybit_rate:
-        raw_parallel    = (binance_rate + bybit_rate) / 2
-        data["binance"] = round(binance_rate, 0)
-        data["bybit"]   = round(bybit_rate,   0)
-    elif binance_rate:
-        raw_parallel    = binance_rate
-        data["binance"] = round(binance_rate, 0)
-        data["bybit"]   = round(binance_rate, 0)
-    elif bybit_rate:
-        raw_parallel    = bybit_rate
-        data["binance"] = round(bybit_rate, 0)
-        data["bybit"]   = round(bybit_rate, 0)
-    else:
-        raw_parallel = None
+    # ── P2P / Parallel rate — median of the venues that answered ─────────────
+    # A venue that did not answer stays None; the renderer falls back per field.
+    p2p = fetched.get("p2p")
+    raw_parallel = p2p["median"] if p2p else None
+    for venue in P2P_VENUES:
+        price = (p2p or {}).get("venues", {}).get(venue)
+        data[venue] = round(price, 0) if price else None
+    if p2p and p2p.get("hi"):
+        data["parallel_hi"], data["parallel_lo"] = p2p["hi"], p2p["lo"]
+    if p2p and not p2p["quorum"]:
+        alerts.append(f"P2P consensus below quorum: only {sorted(p2p['venues'])} answered")
 
     # ── SANITY CHECK: reject if spread is implausibly low ─────────────────────
     cbn = data["cbn"]
@@ -837,241 +1716,209 @@ def fetch_all_data(config):
             print("[WARN] Fallback parallel rate used")
 
     data["usdt_p2p"]   = data["parallel"]
-    data["spread"]     = round(data["parallel"] - cbn, 0)
-    data["spread_pct"] = round((data["spread"] / cbn) * 100, 2) if cbn else 0
+    spread = metrics.Metrics(data)
+    data["spread"]     = spread["spread_ngn"]
+    data["spread_pct"] = spread["spread_pct"]
     print(f"[INFO] Parallel ₦{data['parallel']:.0f} | "
           f"Spread ₦{data['spread']:.0f} ({data['spread_pct']:.1f}%)")
 
-    # Wise rate
-    wise = fetch_wise_rate()
+    # Wise rate — last good value while its breaker is open
+    if "wise" in live:
+        wise = live["wise"]
+        breaker_record(cache, "wise", bool(wise and in_bounds(wise, "cbn")))
+        if wise and in_bounds(wise, "cbn"):
+            cache["last_wise"] = round(wise, 0)
+    else:
+        wise = fetched.get("wise") or cache.get("last_wise")
     data["wise"] = round(wise, 0) if (wise and in_bounds(wise, "cbn")) \
                    else round(data["parallel"] * 0.96, 0)
 
     # ── Crypto (BTC, ETH, BNB) ────────────────────────────────────────────────
-    print("[INFO] Fetching crypto...")
-    crypto = fetch_crypto_prices()
+    crypto = fetched.get("crypto")
     if crypto:
         data.update(crypto)
         for k in ["btc_usd", "eth_usd", "bnb_usd", "sol_usd"]:
             if k in crypto: cache[f"last_{k}"] = crypto[k]
     else:
-        data["btc_usd"] = cache.get("last_btc_usd", 85000)
+        for k in ["btc_usd", "eth_usd", "bnb_usd", "sol_usd"]:
+            data[k] = cache.get(f"last_{k}", snapshot.FALLBACKS[k])
         data["btc_chg"] = None
-        data["eth_usd"] = cache.get("last_eth_usd",  2100)
-        data["sol_usd"] = cache.get("last_sol_usd",  150)
         data["eth_chg"] = None
-        data["bnb_usd"] = cache.get("last_bnb_usd",   580)
         data["bnb_chg"] = None
 
     # ── Gold spot price — ExchangeRate-API first, Stooq fallback ────────────
-    print("[INFO] Fetching gold spot price...")
-    gold_from_fx = fx.get("gold_usd_fx") if fx else None
-    gold = fetch_gold_price(gold_from_fx)
+    gold = fetched["gold"]
     if gold:
         data.update(gold)
         cache["last_gold_usd"] = gold["gold_usd"]
     else:
         # Fallback: use cache only if value is sane, otherwise hardcode
         cached_gold = cache.get("last_gold_usd")
-        if cached_gold and 1500 <= float(cached_gold) <= 3500:
+        if cached_gold and in_bounds(float(cached_gold), "gold_usd"):
             data["gold_usd"] = float(cached_gold)
             print(f"[INFO] Gold fallback (cache): ${data['gold_usd']:,.2f}/oz")
         else:
-            data["gold_usd"] = 2930.0   # Feb 2026 approximate
+            data["gold_usd"] = snapshot.FALLBACKS["gold_usd"]
             print(f"[INFO] Gold fallback (hardcoded): ${data['gold_usd']:,.2f}/oz — cache had bad value {cached_gold}")
         data["gold_chg"] = None
 
     # ── Oil ───────────────────────────────────────────────────────────────────
-    print("[INFO] Fetching oil prices...")
-    oil = fetch_oil_prices()
+    oil = fetched.get("oil")
     if oil:
         data.update(oil)
         cache["last_brent"] = oil["brent"]
     else:
-        b = cache.get("last_brent", 75.0)
+        b = cache.get("last_brent", snapshot.FALLBACKS["brent"])
         data.update({"brent": b, "brent_chg": None,
                      "bonny": round(b + 1.7, 2), "bonny_chg": None})
 
     # ── Global indices ────────────────────────────────────────────────────────
-    print("[INFO] Fetching global indices...")
-    data.update(fetch_global_indices())
-    for k, v in [("sp500",5500),("ftse",8200),("dax",18000),("nikkei",37000),("dxy",103.5)]:
-        data.setdefault(k, v)
+    data.update(fetched.get("global") or {})
+    for k in ("sp500", "ftse", "dax", "nikkei", "dxy"):
+        data.setdefault(k, snapshot.FALLBACKS[k])
         data.setdefault(f"{k}_chg", None)
 
     # Ensure 52-week NGX data survives the data.update() pull
-    ngx_now = data.get("ngx", cache["tier2"].get("ngx_index", 104520))
+    ngx_now = data.get("ngx", cache["tier2"].get("ngx_index", snapshot.FALLBACKS["ngx"]))
     data.setdefault("ngx_52w_high",  ngx_now)
     data.setdefault("ngx_52w_low",   ngx_now)
     data.setdefault("ngx_52w_days",  1)
     data.setdefault("ngx_52w_since", today_str())
 
     # ── African indices ───────────────────────────────────────────────────────
-    print("[INFO] Fetching African indices...")
-    data.update(fetch_african_indices())
-    for k, v in [("jse",80000), ("egx",30000)]:
-        data.setdefault(k, v)
+    data.update(fetched.get("african") or {})
+    for k in ("jse", "egx"):
+        data.setdefault(k, snapshot.FALLBACKS[k])
         data.setdefault(f"{k}_chg", None)
-    data["nse_k"]    = cache.get("last_nsek", 198300)
+    data["nse_k"]    = cache.get("last_nsek", snapshot.FALLBACKS["nse_k"])
     data["nsek_chg"] = None
 
     # ── Commodities ───────────────────────────────────────────────────────────
-    print("[INFO] Fetching commodities...")
-    data.update(fetch_commodities())
-    for k, v in [("silver_usd", 32.0), ("cocoa_usd", 8500)]:
-        data.setdefault(k, v)
+    data.update(fetched.get("commodities") or {})
+    for k in ("silver_usd", "cocoa_usd"):
+        data.setdefault(k, snapshot.FALLBACKS[k])
         base = k.replace("_usd", "")
         data.setdefault(f"{base}_chg", None)
 
     # ── NGX Top Movers — every run (movers change through trading day) ──────────
-    print("[INFO] Fetching NGX top movers...")
-    movers = fetch_ngx_movers(cache)
-    if movers:
-        cache["tier2"]["ngx_movers"]           = movers
-        cache["tier2"]["ngx_movers_available"] = True
-        cache["tier2"]["ngx_movers_date"]      = today_str()
-        reset_failure(cache, "ngx_movers")
-    else:
-        cache["tier2"]["ngx_movers_available"] = False
-        increment_failure(cache, "ngx_movers")
+    if "ngx_movers" in live:
+        movers = live["ngx_movers"]
+        if movers:
+            cache["tier2"]["ngx_movers"]           = movers
+            cache["tier2"]["ngx_movers_available"] = True
+            cache["tier2"]["ngx_movers_date"]      = today_str()
+        else:
+            cache["tier2"]["ngx_movers_available"] = False
+        breaker_record(cache, "ngx_movers", bool(movers))
 
     # ── NGX 52-week high/low tracking ─────────────────────────────────────────
     # Updated every run. Used to render the 52-week range bar in place of movers.
-    ngx_val = cache["tier2"].get("ngx_index", 104520)
-    ngx_hist = cache.get("ngx_52w", {})
-    # Store daily closes keyed by date string
-    ngx_hist[today_str()] = ngx_val
-    # Prune to last 365 days
-    cutoff = (datetime.datetime.now() - datetime.timedelta(days=365)).strftime("%Y-%m-%d")
-    ngx_hist = {d: v for d, v in ngx_hist.items() if d >= cutoff}
-    cache["ngx_52w"] = ngx_hist
-
-    if ngx_hist:
-        values = list(ngx_hist.values())
-        ngx_52w_high = max(values)
-        ngx_52w_low  = min(values)
-        ngx_52w_days = len(ngx_hist)
-        ngx_52w_since = min(ngx_hist.keys())
-    else:
-        ngx_52w_high = ngx_val
-        ngx_52w_low  = ngx_val
-        ngx_52w_days = 1
-        ngx_52w_since = today_str()
-
-    data["ngx_52w_high"]  = ngx_52w_high
-    data["ngx_52w_low"]   = ngx_52w_low
-    data["ngx_52w_days"]  = ngx_52w_days
-    data["ngx_52w_since"] = ngx_52w_since
-    print(f"[INFO] NGX 52w: low={ngx_52w_low:,} | now={ngx_val:,} | high={ngx_52w_high:,} "
-          f"(over {ngx_52w_days} days)")
-
-    # ── Tier 2: Daily scrapes (08:00 only) ───────────────────────────────────
-    if is_first_run_today:
-        print("[INFO] Running Tier 2 daily scrapes...")
-        fuel = fetch_fuel_prices(cache)
+    ngx_val = cache["tier2"].get("ngx_index", snapshot.FALLBACKS["ngx"])
+    if "ngx_52w" in cache:
+        # One-off move of the old date-keyed cache dict into the history store
+        history_store.upsert("ngx", cache.pop("ngx_52w").items())
+    history_store.record("ngx", ngx_val)
+    ngx_52w = rolling_window(cache, "ngx_52w", now).push(ngx_val, now.timestamp())
+    rolling.save(cache, "ngx_52w", ngx_52w)
+    # Days with a stored reading since the window's data starts, as before
+    ngx_seen = history_store.window("ngx", ngx_52w.since(now.timestamp())) or \
+               {"days": 1, "since": today_str()}
+
+    data["ngx_52w_high"]  = ngx_52w.max()
+    data["ngx_52w_low"]   = ngx_52w.min()
+    data["ngx_52w_days"]  = ngx_seen["days"]
+    data["ngx_52w_since"] = ngx_seen["since"]
+    print(f"[INFO] NGX 52w: low={ngx_52w.min():,.0f} | now={ngx_val:,.0f} | "
+          f"high={ngx_52w.max():,.0f} ({data['ngx_52w_days']} days observed)")
+
+    # ── Tier 2: Daily scrapes (once their 20h TTL lapses, unless breaker open) ─
+    if "fuel" in live:
+        fuel = live["fuel"]
+        breaker_record(cache, "fuel", bool(fuel))
         if fuel:
             if "petrol" in fuel: cache["tier2"]["petrol"] = fuel["petrol"]
             if "diesel" in fuel: cache["tier2"]["diesel"] = fuel["diesel"]
             cache["tier2"]["fuel_date"] = today_str()
-            reset_failure(cache, "fuel")
-        else:
-            increment_failure(cache, "fuel")
-            if should_alert(cache, "fuel"):
-                alerts.append("ALERT: Fuel price scrape failed 3+ consecutive days")
+        elif should_alert(cache, "fuel"):
+            alerts.append("ALERT: Fuel price scrape failed 3+ consecutive days")
 
-        reserves = fetch_fx_reserves(cache)
+    if "reserves" in live:
+        reserves = live["reserves"]
+        breaker_record(cache, "reserves", bool(reserves))
         if reserves:
             cache["tier2"]["reserves"]      = reserves
             cache["tier2"]["reserves_date"] = today_str()
-            reset_failure(cache, "reserves")
-        else:
-            increment_failure(cache, "reserves")
+
+    alerts.extend(breaker_alerts(cache))
 
     # ── Weekly hi/lo tracking ─────────────────────────────────────────────────
-    wt = cache.get("weekly_tracking", {})
-    if is_monday and now.hour < 9:
-        wt = {"usd_ngn_week_high": data["parallel"],
-              "usd_ngn_week_low":  data["parallel"],
-              "btc_week_high":     data.get("btc_usd", 0),
-              "btc_week_low":      data.get("btc_usd", 0),
-              "week_start":        today_str()}
-    else:
-        p = data["parallel"]
-        if p > wt.get("usd_ngn_week_high", 0):      wt["usd_ngn_week_high"] = p
-        if p < wt.get("usd_ngn_week_low", 9999999): wt["usd_ngn_week_low"]  = p
-        btc = data.get("btc_usd", 0)
-        if btc:
-            if btc > wt.get("btc_week_high", 0):       wt["btc_week_high"] = btc
-            if btc < wt.get("btc_week_low", 99999999): wt["btc_week_low"]  = btc
-    cache["weekly_tracking"] = wt
-    data["usd_wk_hi"] = wt.get("usd_ngn_week_high", data["parallel"])
-    data["usd_wk_lo"] = wt.get("usd_ngn_week_low",  data["parallel"])
-    data["btc_wk_hi"] = wt.get("btc_week_high",      data.get("btc_usd", 0))
-    data["btc_wk_lo"] = wt.get("btc_week_low",       data.get("btc_usd", 0))
+    # Calendar-week windows reset themselves when Monday comes round.
+    weeks = {name: rolling_window(cache, name, now) for name in ("usd_week", "btc_week")}
+    wt = cache.pop("weekly_tracking", None)
+    if wt and "usd_week" not in cache.get("rolling", {}):
+        # One-off carry-over of the old weekly_tracking dict for this week
+        week_start = wt.get("week_start")
+        start = rolling.day_start(datetime.date.fromisoformat(week_start)) if week_start \
+                else rolling.window_start("week", now.timestamp())
+        for name, key in (("usd_week", "usd_ngn_week"), ("btc_week", "btc_week")):
+            for side in ("high", "low"):
+                if wt.get(f"{key}_{side}"):
+                    weeks[name].push(wt[f"{key}_{side}"], start)
+    weeks["usd_week"].push(data["parallel"], now.timestamp())
+    weeks["btc_week"].push(data.get("btc_usd") or None, now.timestamp())
+    for name, window in weeks.items():
+        rolling.save(cache, name, window)
+    data["usd_wk_hi"] = weeks["usd_week"].max() or data["parallel"]
+    data["usd_wk_lo"] = weeks["usd_week"].min() or data["parallel"]
+    data["btc_wk_hi"] = weeks["btc_week"].max() or data.get("btc_usd", 0)
+    data["btc_wk_lo"] = weeks["btc_week"].min() or data.get("btc_usd", 0)
 
     # ── Pull cached tier data ─────────────────────────────────────────────────
     t2 = cache.get("tier2", {})
     t3 = cache.get("tier3", {})
     t4 = cache.get("tier4", {})
+    fb = snapshot.FALLBACKS
 
     data.update({
-        "petrol":               t2.get("petrol",              897),
-        "diesel":               t2.get("diesel",             1450),
-        "lpg_kg":               t2.get("lpg_kg",             1200),
-        "kerosene":             t2.get("kerosene",            950),
+        "petrol":               t2.get("petrol",              fb["petrol"]),
+        "diesel":               t2.get("diesel",              fb["diesel"]),
+        "lpg_kg":               t2.get("lpg_kg",              fb["lpg_kg"]),
+        "kerosene":             t2.get("kerosene",            fb["kerosene"]),
         "fuel_date":            t2.get("fuel_date",       "unknown"),
-        "ngx":                  t2.get("ngx_index",        104520),
-        "ngx_chg":              t2.get("ngx_change",          0.6),
+        "ngx":                  t2.get("ngx_index",           fb["ngx"]),
+        "ngx_chg":              t2.get("ngx_change",          fb["ngx_chg"]),
         "ngx_movers":           t2.get("ngx_movers",           []),
         "ngx_movers_available": t2.get("ngx_movers_available",False),
         "ngx_movers_date":      t2.get("ngx_movers_date", "unknown"),
-        "reserves":             t2.get("reserves",            34.2),
+        "reserves":             t2.get("reserves",            fb["reserves"]),
         "reserves_date":        t2.get("reserves_date",  "unknown"),
-        "oil_production":       t3.get("oil_production",      1.42),
+        "oil_production":       t3.get("oil_production",      fb["oil_production"]),
         "oil_production_date":  t3.get("oil_production_date","unknown"),
-        "dangote_output":       t3.get("dangote_output",       350),
+        "dangote_output":       t3.get("dangote_output",      fb["dangote_output"]),
         "dangote_date":         t3.get("dangote_date",    "unknown"),
-        "nnpc_import":          t3.get("nnpc_import",         32.4),
+        "nnpc_import":          t3.get("nnpc_import",         fb["nnpc_import"]),
         "nnpc_date":            t3.get("nnpc_date",       "unknown"),
-        "inflation":            t4.get("inflation",           33.2),
+        "inflation":            t4.get("inflation",           fb["inflation"]),
         "inflation_date":       t4.get("inflation_date",  "unknown"),
-        "unemployment":         t4.get("unemployment",         4.3),
+        "unemployment":         t4.get("unemployment",        fb["unemployment"]),
         "unemployment_date":    t4.get("unemployment_date","unknown"),
         "unemployment_note":    t4.get("unemployment_note","NBS 2023 methodology"),
-        "poverty_rate":         t4.get("poverty_rate",        40.1),
+        "poverty_rate":         t4.get("poverty_rate",        fb["poverty_rate"]),
         "poverty_date":         t4.get("poverty_date",      "2024"),
-        "literacy_rate":        t4.get("literacy_rate",       62.0),
-        "avg_income_formal":    t4.get("avg_income_formal", 420000),
+        "literacy_rate":        t4.get("literacy_rate",       fb["literacy_rate"]),
+        "avg_income_formal":    t4.get("avg_income_formal",   fb["avg_income_formal"]),
         "avg_income_date":      t4.get("avg_income_date",   "2025"),
     })
 
-    # ── Calculated fields (all formulas verified) ─────────────────────────────
-
-    # Litres per dollar = parallel_rate / petrol_price
-    # e.g. ₦1600 / ₦900/L = 1.78 L/$1 ✅
-    data["litres_per_dollar"] = round(data["parallel"] / data["petrol"], 2) \
-                                if data["petrol"] else 0
-
-    # Days wages to fill 50L tank
-    # ₦70,000 min wage ÷ 22 working days ≈ ₦3,182/day (formal floor)
-    # Using ₦5,000/day as middle-ground informal worker estimate
-    DAILY_WAGE    = 5000
-    PETROL_2023   = t4.get("petrol_2023_baseline", 200)   # pre-subsidy price ₦200/L
-    data["tank_cost"]      = 50 * data["petrol"]
-    data["tank_days"]      = round(data["tank_cost"] / DAILY_WAGE, 1)
-    data["tank_days_prev"] = round((50 * PETROL_2023) / DAILY_WAGE, 1)
-
-    # Salary erosion — ₦500k/month in USD
-    # yr_ago_rate from cache — set to real Feb 2025 parallel rate
-    yr_ago_rate             = cache.get("yr_ago_rate", 1490)
-    data["salary_ngn"]      = 500000
-    data["salary_usd_now"]  = round(data["salary_ngn"] / data["parallel"], 0) \
-                              if data["parallel"] else 0
-    data["salary_usd_then"] = round(data["salary_ngn"] / yr_ago_rate, 0) \
-                              if yr_ago_rate else 0
-    data["yr_ago_rate"]     = yr_ago_rate
-    data["yr_chg"]          = round(((data["parallel"] - yr_ago_rate) / yr_ago_rate) * 100, 1) \
-                              if yr_ago_rate else 0
+    # ── Calculated fields (formulas in metrics.py) ────────────────────────────
+    # Litres per dollar (₦1600 / ₦900/L = 1.78 L/$1), days of ₦5,000/day wages
+    # to fill a 50L tank now and at the pre-subsidy ₦200/L, ₦500k salary in USD
+    # now and at yr_ago_rate (the real Feb 2025 parallel rate).
+    data["petrol_2023_baseline"] = t4.get("petrol_2023_baseline", fb["petrol_2023_baseline"])
+    data["yr_ago_rate"]          = cache.get("yr_ago_rate", fb["yr_ago_rate"])
+    data.update(metrics.Metrics(data).resolve((
+        "litres_per_dollar", "tank_cost", "tank_days", "tank_days_prev",
+        "salary_ngn", "salary_usd_now", "salary_usd_then", "yr_chg")))
 
     # ── Aza Index — all labels come from total, not from spread alone ─────────
     aza = calculate_aza_index(data)
@@ -1081,28 +1928,33 @@ def fetch_all_data(config):
     data["strength_score"] = aza["strength_score"]  # ← FIXED: from Aza total
 
     # ── Aza history ───────────────────────────────────────────────────────────
-    aza_hist  = cache.get("aza_history", [])
-    aza_dates = cache.get("aza_dates",   [])
-    today_lbl = date_label(now)
-    if not aza_dates or aza_dates[-1] != today_lbl:
-        aza_hist.append(data["aza"])
-        aza_dates.append(today_lbl)
-        aza_hist  = aza_hist[-30:]
-        aza_dates = aza_dates[-30:]
-        cache["aza_history"] = aza_hist
-        cache["aza_dates"]   = aza_dates
-
-    data["aza_hist"]        = aza_hist[-7:]
-    data["aza_dates_short"] = aza_dates[-7:]
-    # Week-on-week change: compare today vs 7 entries ago (true 7-day diff)
-    if len(aza_hist) >= 8:
-        data["aza_chg"] = data["aza"] - aza_hist[-8]
-    elif len(aza_hist) >= 2:
-        data["aza_chg"] = data["aza"] - aza_hist[0]
-    else:
-        data["aza_chg"] = 0
+    # Every run, with its components, in the 30-day ring (aza_ring.py); the
+    # history store keeps the day's last score for the long view.
+    if "aza_history" in cache:
+        history_store.upsert("aza", _label_days(cache.pop("aza_dates", []),
+                                                cache.pop("aza_history"), now))
+    cache.get("rolling", {}).pop("aza_7d", None)
+    ring = aza_ring.load()
+    if not ring["latest"]:
+        start = now.date() - datetime.timedelta(days=aza_ring.DAYS - 1)
+        aza_ring.seed(ring, history_store.rows("aza", start))
+    aza_ring.record(ring, now.timestamp(), aza)
+    aza_ring.save(ring)
+    history_store.record("aza", data["aza"])
+
+    # Sparkline: one bar per day — the day's latest run
+    aza_days = aza_ring.daily(ring, 7)
+    data["aza_hist"]        = [p["total"] for p in aza_days]
+    data["aza_dates_short"] = [date_label(aza_ring.run_day(p["run"])) for p in aza_days]
+    # Changes vs the same run yesterday and a week ago, and the 30-day range
+    data.update(aza_ring.trend(ring))
 
     # ── Save cache ────────────────────────────────────────────────────────────
+    # Daily observations for the local history store (the day's last run wins).
+    # petrol and inflation complete the Aza inputs that backtest.py replays.
+    for series in ("parallel", "cbn", "petrol", "inflation"):
+        history_store.record(series, data.get(series))
+
     cache.update({
         "last_parallel": data["parallel"],
         "last_cbn":      data["cbn"],
@@ -1125,6 +1977,9 @@ def fetch_all_data(config):
     })
     save_cache(cache)
 
+    # Snapshot for the text runs — they load this instead of re-reading cache.json
+    snapshot.save(snapshot.collect(cache, data, now))
+
     # Post time
     data["post_time"]       = now.strftime("%b %d, %Y  •  %H:%M WAT")
     data["post_time_short"] = now.strftime("%b %d, %Y")
@@ -1145,3 +2000,8 @@ def fetch_all_data(config):
     print(f"{'='*52}\n")
 
     return data, alerts
+
+
+if __name__ == "__main__":
+    if "--backfill-history" in sys.argv[1:]:
+        backfill_history()
@@ -0,0 +1,41 @@
+"""
+fx_matrix.py — Cross-rate matrix for every currency in one FX response
+
+ExchangeRate-API returns conversion_rates as units of each currency per 1 USD.
+CrossRates turns that vector v into an N×N matrix in one NumPy step:
+
+    M[i, j] = v[j] / v[i]     units of currency j per 1 unit of currency i
+
+so any pair (EUR→NGN, KES→GHS, …) is a single O(1) lookup.
+"""
+
+import numpy as np
+
+# NGN crosses exposed as data["<code>_ngn"] fields
+NGN_CROSSES = ("EUR", "GBP", "CNY", "CAD", "KES", "GHS", "ZAR", "EGP", "XOF")
+
+
+class CrossRates:
+
+    def __init__(self, usd_rates):
+        self.codes = tuple(sorted(c for c, v in usd_rates.items() if v and v > 0))
+        self.index = {c: i for i, c in enumerate(self.codes)}
+        v = np.array([usd_rates[c] for c in self.codes], dtype=np.float64)
+        self.usd_rates = v           # units per 1 USD, in codes order
+        self.matrix = np.outer(1.0 / v, v)
+
+    def rate(self, base, quote):
+        """Units of quote per 1 base, or None if either currency is unknown."""
+        i, j = self.index.get(base), self.index.get(quote)
+        if i is None or j is None:
+            return None
+        return float(self.matrix[i, j])
+
+    def ngn(self, code, digits=3):
+        """Naira per 1 unit of code."""
+        r = self.rate(code, "NGN")
+        return round(r, digits) if r is not None else None
+
+    def ngn_fields(self):
+        """{"eur_ngn": …, "gbp_ngn": …} for NGN_CROSSES (None where missing)."""
+        return {f"{c.lower()}_ngn": self.ngn(c) for c in NGN_CROSSES}
@@ -0,0 +1,194 @@
+"""
+history_store.py — Local daily price history for NairaIntel Bot
+
+One value per series per day, kept in a columnar, memory-mapped format so
+history reads (52-week ranges, month-ago rates, sparklines) never touch the
+network and never parse JSON.
+
+Layout under history/ (committed back to the repo alongside cache.json):
+  <series>.day   int32   day numbers (date.toordinal()), strictly ascending
+  <series>.val   float64 values, same length and order as .day
+  meta.json      sync bookkeeping ({"synced": ISO date})
+Both columns use native byte order (little-endian on every runner we use).
+
+Reads mmap the two columns and cast them to int32 / float64 memoryviews —
+no copy, no parsing. Date lookups are a bisect over the day column.
+A new day is appended to both files in place; a second write on the same
+day overwrites the last value in place. Only rows older than the newest
+stored day (a backfill) rewrite the files. An interrupted append can leave
+a partial row or one column longer than the other: reads ignore the torn
+tail, and the next append truncates it away before writing.
+
+Market series are backfilled from Stooq once, then topped up with date-range
+queries (see fetcher.history_sync_plan / store_history). Series the bot
+observes itself (NGX index, parallel rate, Aza) are written with record().
+"""
+
+import bisect
+import datetime
+import json
+import mmap
+import os
+import threading
+from array import array
+
+HISTORY_DIR = os.path.join(os.path.dirname(__file__), "history")
+META_FILE   = os.path.join(HISTORY_DIR, "meta.json")
+
+_lock = threading.RLock()
+
+
+def _paths(series):
+    base = os.path.join(HISTORY_DIR, series)
+    return base + ".day", base + ".val"
+
+
+def _day_num(d):
+    if isinstance(d, str):
+        d = datetime.date.fromisoformat(d)
+    return d.toordinal()
+
+
+def _day_str(n):
+    return datetime.date.fromordinal(n).isoformat()
+
+
+def _map(path, fmt):
+    """Whole rows of a column file; a partial trailing row is ignored."""
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            whole = size - size % array(fmt).itemsize
+            if whole == 0:
+                return memoryview(b"").cast(fmt)
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(mm)[:whole].cast(fmt)
+    except FileNotFoundError:
+        return memoryview(b"").cast(fmt)
+
+
+def columns(series):
+    """(days, values) as zero-copy int32 / float64 memoryviews."""
+    with _lock:
+        day_path, val_path = _paths(series)
+        days, vals = _map(day_path, "i"), _map(val_path, "d")
+    n = min(len(days), len(vals))   # a torn append leaves one column longer
+    return days[:n], vals[:n]
+
+
+def _rewrite(series, merged):
+    """Write a whole series (sorted {day_num: value}) via temp files."""
+    for path, fmt, data in zip(_paths(series), ("i", "d"),
+                               (merged.keys(), merged.values())):
+        with open(path + ".tmp", "wb") as f:
+            f.write(array(fmt, data).tobytes())
+        os.replace(path + ".tmp", path)
+
+
+def upsert(series, rows):
+    """Insert or replace (day, value) rows for one series. Returns the row count."""
+    new = sorted({_day_num(day): float(value) for day, value in rows}.items())
+    count = len(new)
+    if not count:
+        return 0
+    with _lock:
+        os.makedirs(HISTORY_DIR, exist_ok=True)
+        days, vals = columns(series)
+        n = len(days)
+        last = days[-1] if n else None
+        if last is None or new[0][0] >= last:
+            del days, vals
+            day_path, val_path = _paths(series)
+            if new[0][0] == last:
+                # Same day again — overwrite the last value in place
+                with open(val_path, "r+b") as f:
+                    f.seek((n - 1) * array("d").itemsize)
+                    f.write(array("d", [new[0][1]]).tobytes())
+                new = new[1:]
+            with open(day_path, "ab") as fd, open(val_path, "ab") as fv:
+                # Cut any torn tail first so the new rows line up
+                fd.truncate(n * array("i").itemsize)
+                fv.truncate(n * array("d").itemsize)
+                fd.write(array("i", [d for d, _ in new]).tobytes())
+                fv.write(array("d", [v for _, v in new]).tobytes())
+        else:
+            merged = dict(zip(days.tolist(), vals.tolist()))
+            del days, vals
+            merged.update(new)
+            _rewrite(series, dict(sorted(merged.items())))
+    return count
+
+
+def record(series, value, day=None):
+    """Store today's (or day's) value for a series the bot observes itself."""
+    if value is not None:
+        upsert(series, [(day or datetime.date.today(), value)])
+
+
+def latest_day(series):
+    """Newest stored day as a datetime.date, or None for an empty series."""
+    days, _ = columns(series)
+    return datetime.date.fromordinal(days[-1]) if len(days) else None
+
+
+def _span(days, start, end):
+    lo = bisect.bisect_left(days, _day_num(start)) if start else 0
+    hi = bisect.bisect_right(days, _day_num(end)) if end else len(days)
+    return lo, hi
+
+
+def rows(series, start=None, end=None):
+    """[(day, value)] in date order, optionally limited to start ≤ day ≤ end."""
+    days, vals = columns(series)
+    lo, hi = _span(days, start, end)
+    return [(_day_str(d), v) for d, v in zip(days[lo:hi], vals[lo:hi])]
+
+
+def tail(series, n):
+    """The last n (day, value) rows."""
+    days, vals = columns(series)
+    return [(_day_str(d), v) for d, v in zip(days[-n:], vals[-n:])] if n else []
+
+
+def value_on(series, day):
+    """Value on day, or the nearest earlier one (markets close at weekends)."""
+    days, vals = columns(series)
+    i = bisect.bisect_right(days, _day_num(day))
+    return vals[i - 1] if i else None
+
+
+def window(series, start, end=None):
+    """
+    {"low", "high", "days", "since"} over start ≤ day ≤ end,
+    or None when the series has no rows in that window.
+    """
+    days, vals = columns(series)
+    lo, hi = _span(days, start, end)
+    if lo >= hi:
+        return None
+    span = vals[lo:hi]
+    return {"low": min(span), "high": max(span), "days": hi - lo,
+            "since": _day_str(days[lo])}
+
+
+def _load_meta():
+    try:
+        with open(META_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def get_meta(key, default=None):
+    with _lock:
+        return _load_meta().get(key, default)
+
+
+def set_meta(key, value):
+    with _lock:
+        meta = _load_meta()
+        meta[key] = str(value)
+        os.makedirs(HISTORY_DIR, exist_ok=True)
+        with open(META_FILE, "w") as f:
+            json.dump(meta, f, indent=1)
+
@@ -0,0 +1,120 @@
+"""
+http_cache.py — Conditional-GET cache for scraped pages and RSS feeds
+
+The fuel pages, the CBN reserves page and the fintech RSS feeds rarely change
+between runs. get_parsed() stores each response's ETag / Last-Modified plus
+the parsed result on disk and sends If-None-Match / If-Modified-Since next
+time. A 304 is answered from disk without downloading or re-parsing.
+
+Layout (restored between workflow runs by actions/cache):
+  .http_cache/index.json      url → validators, parsed result, size, last use
+  .http_cache/<sha1>.body     raw response body
+
+Total body size is capped at MAX_BYTES; least recently used entries go first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import http_client
+
+CACHE_DIR  = os.path.join(os.path.dirname(__file__), ".http_cache")
+INDEX_FILE = os.path.join(CACHE_DIR, "index.json")
+MAX_BYTES  = 8 * 1024 * 1024
+
+_lock  = threading.Lock()
+_index = None
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        try:
+            with open(INDEX_FILE, "r") as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save_index():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = INDEX_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(_index, f, indent=1)
+    os.replace(tmp, INDEX_FILE)
+
+
+def _body_path(entry):
+    return os.path.join(CACHE_DIR, entry["file"])
+
+
+def _evict():
+    """Drop least recently used bodies until the cache fits in MAX_BYTES."""
+    total = sum(e["size"] for e in _index.values())
+    for url, entry in sorted(_index.items(), key=lambda kv: kv[1]["used"]):
+        if total <= MAX_BYTES:
+            break
+        try:
+            os.remove(_body_path(entry))
+        except OSError:
+            pass
+        total -= entry["size"]
+        del _index[url]
+        print(f"[DEBUG] http_cache: evicted {url}")
+
+
+def get_parsed(url, parse, timeout=15, headers=None):
+    """
+    Conditional GET of url, returning parse(text).
+    304 → the parsed result stored with the cached body (parse is not called).
+    200 → parse the fresh body; stored only if the server sent validators.
+    Network and HTTP errors propagate to the caller.
+    """
+    with _lock:
+        entry = _load_index().get(url)
+    req_headers = dict(headers or {})
+    if entry:
+        if entry.get("etag"):
+            req_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            req_headers["If-Modified-Since"] = entry["last_modified"]
+
+    r = http_client.get(url, timeout=timeout, headers=req_headers)
+
+    if r.status_code == 304 and entry:
+        with _lock:
+            entry["used"] = time.time()
+            _save_index()
+        print(f"[DEBUG] http_cache: 304 {url}")
+        if "parsed" in entry:
+            return entry["parsed"]
+        with open(_body_path(entry), "r", encoding="utf-8") as f:
+            return parse(f.read())
+
+    r.raise_for_status()
+    text = r.text
+    parsed = parse(text)
+
+    etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+    if etag or last_modified:
+        body = text.encode("utf-8")
+        new_entry = {
+            "file":          hashlib.sha1(url.encode()).hexdigest() + ".body",
+            "etag":          etag,
+            "last_modified": last_modified,
+            "size":          len(body),
+            "used":          time.time(),
+            "parsed":        parsed,
+        }
+        with _lock:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(_body_path(new_entry), "wb") as f:
+                f.write(body)
+            _index[url] = new_entry
+            _evict()
+            _save_index()
+    return parsed
@@ -0,0 +1,120 @@
+"""
+http_client.py — Shared HTTP layer for NairaIntel Bot
+
+Every fetcher goes through this module instead of calling requests.get /
+requests.post directly, so one run reuses keep-alive connections per host
+(stooq.com and finance.yahoo.com are hit many times per run) instead of
+paying a fresh TCP+TLS handshake for each request.
+
+Default headers, timeouts and the retry policy live here in one place.
+stats() reports how many requests were served over reused connections.
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# One pool per host; sized to the fetch stage's worker count so concurrent
+# requests to the same host never queue for a socket.
+POOL_HOSTS    = 32
+POOL_PER_HOST = 8
+
+# Retry transient server/connection errors once, quickly. 429 is left out on
+# purpose — retrying a throttled host straight away only makes it worse.
+RETRY = Retry(
+    total=2, connect=2, read=1,
+    backoff_factor=0.5,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "POST"}),
+    raise_on_status=False,
+)
+
+_lock = threading.Lock()
+_counts = {"requests": 0, "connections": 0}
+
+
+def _count(key):
+    with _lock:
+        _counts[key] += 1
+
+
+class _HTTPPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _count("connections")
+        return super()._new_conn()
+
+
+class _HTTPSPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _count("connections")
+        return super()._new_conn()
+
+
+class _CountingAdapter(HTTPAdapter):
+    """
+    The shared adapter. It counts every request sent and every connection
+    opened through it, so stats() covers the get()/post() helpers and
+    new_session() sessions alike.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _HTTPPool, "https": _HTTPSPool}
+
+    def send(self, request, **kwargs):
+        _count("requests")
+        return super().send(request, **kwargs)
+
+
+_adapter = _CountingAdapter(pool_connections=POOL_HOSTS,
+                            pool_maxsize=POOL_PER_HOST,
+                            max_retries=RETRY)
+
+
+def new_session(headers=None):
+    """
+    Session with its own cookie jar but the shared connection pools.
+    Use for sites that need cookies (Yahoo); everything else uses get()/post().
+    """
+    s = requests.Session()
+    s.headers.update(DEFAULT_HEADERS)
+    if headers:
+        s.headers.update(headers)
+    s.mount("https://", _adapter)
+    s.mount("http://",  _adapter)
+    return s
+
+
+_session = new_session()
+
+
+def request(method, url, timeout=DEFAULT_TIMEOUT, session=None, **kwargs):
+    return (session or _session).request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return request("GET", url, timeout=timeout, **kwargs)
+
+
+def post(url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return request("POST", url, timeout=timeout, **kwargs)
+
+
+def reset_stats():
+    """Start a fresh stats window (called at the start of each run)."""
+    with _lock:
+        _counts["requests"] = _counts["connections"] = 0
+
+
+def stats():
+    """Requests, new connections and reused connections since reset_stats()."""
+    with _lock:
+        reqs, conns = _counts["requests"], _counts["connections"]
+    return {"requests": reqs, "connections": conns,
+            "reused": max(reqs - conns, 0)}
@@ -0,0 +1,168 @@
+"""
+metrics.py — Derived-metrics graph for NairaIntel Bot
+
+Every value computed from the live inputs (parallel, cbn, petrol, inflation,
+food prices…) is one node in METRICS: a function of a Metrics view that
+reads its own inputs — raw values or other nodes — by key. Nothing is
+computed up front. A Metrics view resolves a key on first access and
+memoizes it, so a template that references {deval_pct} computes deval_pct
+and parallel, and nothing else.
+
+Lookup order for a key:
+  1. memo      — already resolved on this view
+  2. aliases   — a template's name for a graph node (e.g. remit_500 → parallel_500)
+  3. data      — the snapshot itself (a value already present wins)
+  4. METRICS   — the derived node
+  5. defaults  — the caller's fallback for a missing input
+A key found nowhere raises KeyError, as str.format_map expects. So does a
+node whose inputs are unusable (None, or a zero divisor): TypeError and
+ZeroDivisionError from a node become KeyError, so `in`, .get() and
+format_map treat it as missing instead of crashing.
+
+Used by fetch_all_data (image fields), text_main (the text-post snapshot),
+facts_pool.render_fact and type_f_pool.render_type_f.
+"""
+
+import datetime
+from collections.abc import Mapping
+
+SALARY_NGN  = 500000   # reference salary for "₦500k in dollars"
+MIN_WAGE    = 70000    # ₦/month national minimum wage
+WORK_DAYS   = 22       # working days per month
+DAILY_WAGE  = 5000     # ₦/day informal worker estimate (tank days)
+WAT         = datetime.timezone(datetime.timedelta(hours=1))
+
+
+def _pct_from(base):
+    return lambda m: round(((m["parallel"] - base) / base) * 100, 1)
+
+
+# name → fn(m); m[...] resolves inputs and other nodes lazily
+METRICS = {
+    # ── Calendar ──────────────────────────────────────────────────────────────
+    # Read time, not snapshot time: a text run on 1 January posts the new year
+    "yr":                lambda m: datetime.datetime.now(WAT).year,
+
+    # ── FX ────────────────────────────────────────────────────────────────────
+    "spread_ngn":        lambda m: round(m["parallel"] - m["cbn"], 0),
+    "spread_pct":        lambda m: round((m["spread_ngn"] / m["cbn"]) * 100, 2)
+                                   if m["cbn"] > 0 else 0,
+    "deval_pct":         _pct_from(0.66),   # 1973 peg
+    "deval_from_2015":   _pct_from(197),
+    "deval_from_2020":   _pct_from(360),
+    "deval_from_2023":   _pct_from(460),    # pre-float
+    "yr_chg":            lambda m: round(((m["parallel"] - m["yr_ago_rate"]) /
+                                          m["yr_ago_rate"]) * 100, 1)
+                                   if m["yr_ago_rate"] else 0,
+    "parallel_500":      lambda m: round(500 * m["parallel"], 0),
+    "parallel_1000":     lambda m: round(1000 * m["parallel"], 0),
+    "converted_ngn":     lambda m: round(2778 * m["parallel"], 0),
+
+    # ── Salaries and wages ────────────────────────────────────────────────────
+    "salary_ngn":        lambda m: SALARY_NGN,
+    "salary_usd":        lambda m: round(m["salary_ngn"] / m["parallel"])
+                                   if m["parallel"] else 333,
+    "salary_usd_now":    lambda m: round(m["salary_ngn"] / m["parallel"], 0)
+                                   if m["parallel"] else 0,
+    "salary_usd_then":   lambda m: round(m["salary_ngn"] / m["yr_ago_rate"], 0)
+                                   if m["yr_ago_rate"] else 0,
+    "min_wage_usd":      lambda m: round(MIN_WAGE / m["parallel"], 1) if m["parallel"] else 0,
+    "min_wage_daily":    lambda m: round(MIN_WAGE / WORK_DAYS, 0),
+    "min_wage_poverty_x": lambda m: round(m["min_wage_daily"] / m["poverty_line_naira"], 1),
+    "inflation_adjusted_wage": lambda m: round(30000 * (1 + 2.2), 0),  # ~3.2x since 2019
+    "civil_servant_usd": lambda m: round(150000 / m["parallel"], 1) if m["parallel"] else 0,
+    "poverty_line_naira": lambda m: round(2.15 * m["parallel"], 0),
+    "uk_salary_naira":   lambda m: round(3500 * m["parallel"], 0),
+    "uk_multiplier":     lambda m: round(m["uk_salary_naira"] / 300000, 1),
+    "doctor_uk_naira":   lambda m: round(8000 * m["parallel"], 0),
+
+    # ── Fuel ──────────────────────────────────────────────────────────────────
+    "litres_per_dollar": lambda m: round(m["parallel"] / m["petrol"], 2) if m["petrol"] else 0,
+    "litres_per_1k":     lambda m: round(1000 / m["petrol"], 2) if m["petrol"] else 0,
+    "million_naira_petrol": lambda m: round(1000000 / m["petrol"], 1) if m["petrol"] else 0,
+    "tank_cost":         lambda m: 50 * m["petrol"],
+    "tank_days":         lambda m: round(m["tank_cost"] / DAILY_WAGE, 1),
+    "tank_days_prev":    lambda m: round((50 * m["petrol_2023_baseline"]) / DAILY_WAGE, 1),
+    "tank_days_wages":   lambda m: round(m["tank_cost"] / (MIN_WAGE / WORK_DAYS), 1),
+
+    # ── Inflation and savings ─────────────────────────────────────────────────
+    "inflation_vs_target": lambda m: round(m["inflation"] / 9, 1),
+    "real_return":       lambda m: round(11 - m["inflation"], 1),   # 11% savings rate
+    "tbill_real":        lambda m: round(20 - m["inflation"], 1),   # 20% T-bill yield
+    "inflation_erosion": lambda m: round(100000 * (1 - (1 / (1 + m["inflation"] / 100))), 0),
+    "inflation_half":    lambda m: round(72 / m["inflation"], 1) if m["inflation"] else 0,
+
+    # ── Food ──────────────────────────────────────────────────────────────────
+    # Daily survival estimate: rice for 30 days + tomatoes for 15 + a loaf every 3
+    "food_daily":        lambda m: round(m["rice_50kg"] / 30 + m["tomato_basket"] / 15 +
+                                         m["bread_loaf"] / 3, -2),
+    "survival_daily":    lambda m: round(m["food_daily"] + 600 + 200, -2),  # + transport + data
+    "survival_monthly":  lambda m: round(m["survival_daily"] * 30, -2),
+    "rice_daily":        lambda m: round(m["rice_50kg"] / 30, -1),
+    "rice_per_kg":       lambda m: round(m["rice_50kg"] / 50, -1),
+    "rice_wage_pct":     lambda m: round(m["rice_50kg"] / MIN_WAGE * 100, 0),
+
+    # ── National accounts (₦ trillions unless noted) ─────────────────────────
+    "external_debt_ngn": lambda m: round(42.3 * m["parallel"] / 1000, 2),
+    "remittance_ngn":    lambda m: round(20 * m["parallel"] / 1000, 1),        # $20B
+    "remittance_ngn_2023": lambda m: round(19.5e9 * m["parallel"] / 1e12, 1),  # $19.5B
+    "corruption_cost_ngn":    lambda m: round(18e9 * m["parallel"] / 1e12, 1),
+    "corruption_cost_ngn_hi": lambda m: round(32e9 * m["parallel"] / 1e12, 1),
+    "efcc_recovery_ngn": lambda m: round(1.2e9 * m["parallel"] / 1e12, 1),
+    "flare_naira":       lambda m: round(2.5 * m["parallel"] / 1000, 2),       # ₦ billions
+    "daily_oil_rev":     lambda m: round(1.4e6 * (m["brent"] * 0.2) / 1e6, 0),  # $M/day
+    "import_cover":      lambda m: round(m["reserves"] / 50 * 12, 0),           # months
+}
+
+
+class Metrics(Mapping):
+    """Lazy, memoized view of a data snapshot plus every METRICS node."""
+
+    def __init__(self, data, defaults=None, aliases=None):
+        # A view over another view reads the same raw snapshot with its own
+        # defaults — memoized values depend on defaults, so they are not shared
+        self.data     = data.data if isinstance(data, Metrics) else data
+        self.defaults = defaults or {}
+        self.aliases  = aliases or {}
+        self._memo    = {}
+
+    def __getitem__(self, key):
+        if key in self._memo:
+            return self._memo[key]
+        if key in self.aliases:
+            value = self[self.aliases[key]]
+        elif key in self.data:
+            value = self.data[key]
+        elif key in METRICS:
+            try:
+                value = METRICS[key](self)
+            except (TypeError, ZeroDivisionError) as e:
+                raise KeyError(key) from e
+        elif key in self.defaults:
+            value = self.defaults[key]
+        else:
+            raise KeyError(key)
+        self._memo[key] = value
+        return value
+
+    def _keys(self):
+        return dict.fromkeys([*self.data, *METRICS, *self.defaults, *self.aliases])
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        # Every key the view knows, without evaluating it — a node whose inputs
+        # are missing still raises KeyError when read (see resolve() / .get)
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def resolve(self, keys):
+        """{key: value} for the given keys — for callers that need a plain dict."""
+        return {key: self[key] for key in keys}
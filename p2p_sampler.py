@@ -0,0 +1,207 @@
+"""
+p2p_sampler.py — Resident intraday P2P sampler
+Polls the P2P venues every few minutes into a fixed-size ring buffer on disk,
+so the posting run reads a time-weighted average instead of one live sample.
+
+  python p2p_sampler.py           # sample forever, every SAMPLE_INTERVAL s
+  python p2p_sampler.py --once    # take one sample and exit (cron-friendly)
+
+File layout (little-endian, P2P_SAMPLES_FILE, default p2p_samples.bin):
+  header   magic, version, capacity, head, count, day,
+           area, weight, hi, lo, last_ts, last_median, n_venues
+  venues   n_venues doubles — last price per P2P venue (0 = no answer)
+  slots    capacity × (ts, median)
+
+The header carries running TWAP sums (area / weight) and the intraday
+high/low, updated on every append and eviction, so read_summary() reads
+only the header and never scans the slots. Samples older than WINDOW are
+evicted on append, so the TWAP covers the last WINDOW seconds whatever the
+interval or scheduler delays; CAPACITY is sized from the interval to hold
+one WINDOW of on-time samples.
+"""
+
+import datetime
+import os
+import struct
+import sys
+import time
+
+SAMPLES_FILE    = os.environ.get("P2P_SAMPLES_FILE",
+                                 os.path.join(os.path.dirname(__file__), "p2p_samples.bin"))
+SAMPLE_INTERVAL = int(os.environ.get("P2P_SAMPLE_INTERVAL", "300"))
+WINDOW          = 6 * 3600    # the TWAP covers this many seconds
+CAPACITY        = max(2, WINDOW // SAMPLE_INTERVAL)
+# Older than this → the posting run prices P2P live. GitHub Actions often
+# starts */15 cron runs 15–45 minutes late, so never less than an hour.
+MAX_AGE         = max(2 * SAMPLE_INTERVAL, 3600)
+
+MAGIC   = b"P2PR"
+VERSION = 1
+HEADER  = struct.Struct("<4sHHIIidddddddI")
+SLOT    = struct.Struct("<dd")
+
+
+def _weight(t_from, t_to):
+    """
+    Time a sample stays in force, capped so a gap while the sampler was down
+    does not hand one stale price most of the average.
+    """
+    return max(0.0, min(t_to - t_from, 2 * SAMPLE_INTERVAL))
+
+
+def _empty(n_venues):
+    return {"capacity": CAPACITY, "head": 0, "count": 0, "day": 0,
+            "area": 0.0, "weight": 0.0, "hi": 0.0, "lo": 0.0,
+            "last_ts": 0.0, "last_median": 0.0,
+            "venues": [0.0] * n_venues,
+            "slots": bytearray(CAPACITY * SLOT.size)}
+
+
+def _read_header(f):
+    raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        return None
+    (magic, version, _, capacity, head, count, day, area, weight,
+     hi, lo, last_ts, last_median, n_venues) = HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION:
+        return None
+    venues = struct.unpack(f"<{n_venues}d", f.read(8 * n_venues))
+    return {"capacity": capacity, "head": head, "count": count, "day": day,
+            "area": area, "weight": weight, "hi": hi, "lo": lo,
+            "last_ts": last_ts, "last_median": last_median,
+            "venues": list(venues)}
+
+
+def _load(path, n_venues):
+    try:
+        with open(path, "rb") as f:
+            ring = _read_header(f)
+            if ring is None or ring["capacity"] != CAPACITY \
+                    or len(ring["venues"]) != n_venues:
+                return _empty(n_venues)
+            ring["slots"] = bytearray(f.read(CAPACITY * SLOT.size))
+            return ring
+    except OSError:
+        return _empty(n_venues)
+
+
+def _save(path, ring):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, ring["capacity"], ring["head"],
+                            ring["count"], ring["day"], ring["area"],
+                            ring["weight"], ring["hi"], ring["lo"],
+                            ring["last_ts"], ring["last_median"],
+                            len(ring["venues"])))
+        f.write(struct.pack(f"<{len(ring['venues'])}d", *ring["venues"]))
+        f.write(ring["slots"])
+    os.replace(tmp, path)
+
+
+def _slot(ring, i):
+    return SLOT.unpack_from(ring["slots"], (i % ring["capacity"]) * SLOT.size)
+
+
+def _evict(ring):
+    """Drop the oldest sample and its share of the TWAP sums."""
+    oldest = ring["head"] - ring["count"]
+    t0, p0 = _slot(ring, oldest)
+    if ring["count"] > 1:
+        w = _weight(t0, _slot(ring, oldest + 1)[0])
+        ring["area"]   -= p0 * w
+        ring["weight"] -= w
+    else:
+        ring["area"] = ring["weight"] = 0.0
+    ring["count"] -= 1
+
+
+def append(ring, ts, median, venue_prices):
+    """Add one sample, evicting the oldest when full or outside WINDOW. Amortised O(1)."""
+    cap = ring["capacity"]
+    while ring["count"] and (ring["count"] == cap
+                             or _slot(ring, ring["head"] - ring["count"])[0] < ts - WINDOW):
+        _evict(ring)
+    if ring["count"]:
+        w = _weight(ring["last_ts"], ts)
+        ring["area"]   += ring["last_median"] * w
+        ring["weight"] += w
+
+    SLOT.pack_into(ring["slots"], ring["head"] * SLOT.size, ts, median)
+    ring["head"]   = (ring["head"] + 1) % cap
+    ring["count"] += 1
+
+    day = datetime.date.fromtimestamp(ts).toordinal()
+    if day != ring["day"]:
+        ring["day"], ring["hi"], ring["lo"] = day, median, median
+    else:
+        ring["hi"] = max(ring["hi"], median)
+        ring["lo"] = min(ring["lo"], median)
+    ring["last_ts"], ring["last_median"] = ts, median
+    ring["venues"] = [float(p or 0) for p in venue_prices]
+
+
+def read_summary(venue_names, path=SAMPLES_FILE, now=None):
+    """
+    {"twap", "hi", "lo", "last", "samples", "age", "venues"} from the header
+    alone, or None when the file is missing, foreign or older than MAX_AGE.
+    """
+    now = now or time.time()
+    try:
+        with open(path, "rb") as f:
+            ring = _read_header(f)
+    except OSError:
+        return None
+    if ring is None or not ring["count"]:
+        return None
+    if now - ring["last_ts"] > MAX_AGE:
+        print(f"[WARN] P2P sampler: last sample {round(now - ring['last_ts'])}s ago "
+              f"(limit {MAX_AGE}s) — pricing P2P live")
+        return None
+    twap = ring["area"] / ring["weight"] if ring["weight"] > 0 else ring["last_median"]
+    today = datetime.date.fromtimestamp(now).toordinal() == ring["day"]
+    venues = {}
+    if len(ring["venues"]) == len(venue_names):
+        venues = {n: p for n, p in zip(venue_names, ring["venues"]) if p}
+    return {"twap": round(twap, 0),
+            "hi": ring["hi"] if today else None,
+            "lo": ring["lo"] if today else None,
+            "last": ring["last_median"],
+            "samples": ring["count"],
+            "age": round(now - ring["last_ts"]),
+            "venues": venues}
+
+
+def sample_once(path=SAMPLES_FILE):
+    """Query every venue once and append the consensus to the ring."""
+    from fetcher import P2P_VENUES, fetch_p2p_consensus
+
+    p2p = fetch_p2p_consensus()
+    if not p2p:
+        print("[WARN] Sampler: no P2P venue answered — sample skipped")
+        return False
+    names = list(P2P_VENUES)
+    ring = _load(path, len(names))
+    append(ring, time.time(), p2p["median"],
+           [p2p["venues"].get(n) for n in names])
+    _save(path, ring)
+    print(f"[INFO] Sampler: ₦{p2p['median']:.0f} "
+          f"({ring['count']}/{ring['capacity']} samples)")
+    return True
+
+
+def main():
+    if "--once" in sys.argv[1:]:
+        sample_once()
+        return
+    print(f"[INFO] Sampler: every {SAMPLE_INTERVAL}s → {SAMPLES_FILE}")
+    while True:
+        started = time.time()
+        try:
+            sample_once()
+        except Exception as e:
+            print(f"[WARN] Sampler: {e}")
+        time.sleep(max(0, SAMPLE_INTERVAL - (time.time() - started)))
+
+
+if __name__ == "__main__":
+    main()
@@ -193,6 +193,9 @@ def render_image1(data, out_path):
     rows = [
         ("CBN Official",  ngn(data["cbn"]),       WHITE),
         ("Parallel Mkt",  ngn(data["parallel"]),   YELLOW),
+        # Intraday P2P range when the sampler's ring is fresh, else the live USDT rate
+        ("P2P Day Range", f"{ngn(data['parallel_lo'])}–{ngn(data['parallel_hi'])}", WHITE)
+        if data.get("parallel_hi") else
         ("USDT P2P",      ngn(data["usdt_p2p"]),   WHITE),
         ("Spread",        f"{ngn(data['spread'])} ({data['spread_pct']:.1f}%)", RED),
         ("EUR / NGN",     ngn(data.get("eur_ngn")), LGRAY),
@@ -857,6 +860,9 @@ def render_image4(data, out_path):
     else:
         chg_str = "Unchanged from last week"
         chg_col = LGRAY
+    day_chg = data.get("aza_day_chg")
+    if hist_len > 1 and day_chg:
+        chg_str += f"  •  {'▲' if day_chg > 0 else '▼'}{abs(day_chg)} vs yesterday"
     ct(draw, chg_str, f(LS_R, 14), CX+CW//2, CY+202, chg_col)
 
     # Speedometer — no text on the arc at all
@@ -889,7 +895,10 @@ def render_image4(data, out_path):
     hist  = data.get("aza_hist", [])
     dates = data.get("aza_dates_short", [])
     sl_top = leg_y_start + 2*26 + 14
-    ct(draw, "7-day trend", f(LS_R, 13), CX+CW//2, sl_top, LGRAY)
+    trend_lbl = "7-day trend"
+    if data.get("aza_30d_lo") is not None and len(hist) > 1:
+        trend_lbl += f"  •  30-day range {data['aza_30d_lo']}–{data['aza_30d_hi']}"
+    ct(draw, trend_lbl, f(LS_R, 13), CX+CW//2, sl_top, LGRAY)
 
     if not hist:
         # First run — no history yet, show a message
@@ -0,0 +1,142 @@
+"""
+rolling.py — Rolling-window statistics for NairaIntel Bot
+
+A RollingWindow tracks min / max (monotonic deques) and, optionally, running
+sum / count / oldest sample over a window that is either
+  trailing:  "7d", "52w" — the last N days/weeks up to now
+  calendar:  "week", "month" — since Monday 00:00 / the 1st of the month
+Every push and query first expires samples older than the window start, so a
+calendar window resets itself when the week or month rolls over — no
+"is it Monday morning?" checks. Updates are O(1) amortised.
+
+State lives in cache["rolling"][name] and survives between runs:
+  {"span", "first", "min": [[t, v]…], "max": [[t, v]…],
+   "samples": [[t, v]…], "sum"}      (samples/sum only when keep_samples)
+Times are POSIX seconds. Calendar boundaries (midnight, Monday, the 1st)
+are WAT whatever the host clock says — image runs set TZ=Africa/Lagos, text
+runs read the same state on a UTC runner.
+"""
+
+import datetime
+import time
+from collections import deque
+
+WAT = datetime.timezone(datetime.timedelta(hours=1))
+
+# name → (source series, span, keep_samples)
+WINDOWS = {
+    "ngx_52w":  ("ngx",      "52w",  False),
+    "usd_week": ("parallel", "week", False),
+    "btc_week": ("btc_usd",  "week", False),
+}
+
+
+def window_start(span, now):
+    """POSIX time where a window that ends at now begins."""
+    dt = datetime.datetime.fromtimestamp(now, WAT)
+    midnight = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    if span == "week":
+        start = midnight - datetime.timedelta(days=dt.weekday())
+    elif span == "month":
+        start = midnight.replace(day=1)
+    elif span.endswith("w"):
+        start = midnight - datetime.timedelta(weeks=int(span[:-1]))
+    elif span.endswith("d"):
+        start = midnight - datetime.timedelta(days=int(span[:-1]))
+    else:
+        raise ValueError(f"unknown window span {span!r}")
+    return start.timestamp()
+
+
+def day_start(day):
+    """POSIX time of WAT midnight at the start of a date."""
+    return datetime.datetime.combine(day, datetime.time(), WAT).timestamp()
+
+
+def wat_date(t):
+    return datetime.datetime.fromtimestamp(t, WAT).date()
+
+
+class RollingWindow:
+
+    def __init__(self, span, keep_samples=False, state=None):
+        state = state or {}
+        self.span  = span
+        self.first = state.get("first")
+        self.lo    = deque(tuple(p) for p in state.get("min", []))
+        self.hi    = deque(tuple(p) for p in state.get("max", []))
+        self.samples = deque(tuple(p) for p in state.get("samples", [])) \
+            if keep_samples else None
+        self.sum   = state.get("sum", 0.0)
+
+    def expire(self, now=None):
+        start = window_start(self.span, now or time.time())
+        while self.lo and self.lo[0][0] < start:
+            self.lo.popleft()
+        while self.hi and self.hi[0][0] < start:
+            self.hi.popleft()
+        while self.samples and self.samples[0][0] < start:
+            self.sum -= self.samples.popleft()[1]
+        return self
+
+    def push(self, value, t=None):
+        if value is None:
+            return self
+        t = t or time.time()
+        self.expire(t)
+        while self.lo and self.lo[-1][1] >= value:
+            self.lo.pop()
+        self.lo.append((t, value))
+        while self.hi and self.hi[-1][1] <= value:
+            self.hi.pop()
+        self.hi.append((t, value))
+        if self.samples is not None:
+            self.samples.append((t, value))
+            self.sum += value
+        if self.first is None:
+            self.first = t
+        return self
+
+    def min(self):
+        return self.lo[0][1] if self.lo else None
+
+    def max(self):
+        return self.hi[0][1] if self.hi else None
+
+    def count(self):
+        return len(self.samples) if self.samples is not None else None
+
+    def mean(self):
+        return self.sum / len(self.samples) if self.samples else None
+
+    def oldest(self):
+        """Oldest sample still in the window (needs keep_samples)."""
+        return self.samples[0][1] if self.samples else None
+
+    def since(self, now=None):
+        """Date the window's data starts: its start, or the first sample if later."""
+        start = window_start(self.span, now or time.time())
+        t = max(start, self.first) if self.first else start
+        return wat_date(t)
+
+    def to_state(self):
+        state = {"span": self.span, "first": self.first,
+                 "min": [list(p) for p in self.lo],
+                 "max": [list(p) for p in self.hi]}
+        if self.samples is not None:
+            state["samples"] = [list(p) for p in self.samples]
+            state["sum"] = self.sum
+        return state
+
+
+def load(cache, name, now=None):
+    """The named window from cache (empty if never used), already expired to now."""
+    _, span, keep = WINDOWS[name]
+    state = cache.get("rolling", {}).get(name)
+    if state and state.get("span") != span:
+        state = None   # span changed in WINDOWS — start over
+    return RollingWindow(span, keep, state).expire(now)
+
+
+def save(cache, name, window):
+    cache.setdefault("rolling", {})[name] = window.to_state()
@@ -0,0 +1,205 @@
+"""
+snapshot.py — Immutable live-data snapshot handed from the image run to text runs
+
+fetch_all_data() ends by writing every value the text posts read to
+live_data.bin. text_main loads it with one read, so it does not walk
+cache.json, look up history or rolling windows, or keep fallback literals
+of its own.
+
+LiveData is a read-only Mapping with __slots__ (one slot per field), so the
+text-post code keeps using d["parallel"] / d.get(...) and metrics.Metrics
+can wrap it for the derived values.
+
+Binary layout (little-endian):
+  header  <4sIdQQ   magic b"NILD", CRC of the FIELDS names, written_at (POSIX),
+                    int mask, None mask (bit i ↔ FIELDS[i])
+  values  <Nd       one float64 per FIELDS entry (ints and None via the masks)
+A file written under a different FIELDS list (an older deploy) fails the CRC
+check, and text_main rebuilds the snapshot from cache.json with collect().
+
+FALLBACKS is the one table of last-resort values for both runs.
+"""
+
+import datetime
+import os
+import struct
+import zlib
+from collections.abc import Mapping
+
+import aza_ring
+import history_store
+import rolling
+
+SNAPSHOT_FILE = os.path.join(os.path.dirname(__file__), "live_data.bin")
+MAGIC = b"NILD"
+
+FIELDS = (
+    "parallel", "cbn", "prev_parallel",
+    "btc_usd", "eth_usd", "bnb_usd", "sol_usd", "gold_usd", "brent",
+    "inflation", "prev_inflation", "petrol", "prev_petrol", "diesel", "lpg_kg",
+    "ngx", "ngx_chg", "reserves", "oil_production",
+    "usd_wk_hi", "usd_wk_lo", "btc_wk_hi", "btc_wk_lo",
+    "eur_ngn", "gbp_ngn", "cad_ngn",
+    "rice_50kg", "tomato_basket", "egg_crate", "bread_loaf",
+    "aza", "aza_chg", "aza_day_chg", "aza_30d_lo", "aza_30d_hi",
+)
+
+HEADER = struct.Struct("<4sIdQQ")
+VALUES = struct.Struct(f"<{len(FIELDS)}d")
+SCHEMA = zlib.crc32(",".join(FIELDS).encode())
+
+# Last-resort values when neither this run nor cache.json has a field
+FALLBACKS = {
+    "parallel": 1499,   "cbn": 1346,
+    "btc_usd": 68000,   "eth_usd": 2100,   "bnb_usd": 600,   "sol_usd": 150,
+    "gold_usd": 2930.0, "brent": 75.0,
+    "inflation": 33.2,  "petrol": 897,     "diesel": 1450,   "lpg_kg": 1200,
+    "ngx": 104520,      "ngx_chg": 0.6,    "reserves": 34.2, "oil_production": 1.42,
+    # Food prices — updated manually in cache.json tier4 when prices change
+    "rice_50kg": 95000, "tomato_basket": 3000, "egg_crate": 3200, "bread_loaf": 1200,
+    # NGN crosses (fx_matrix.NGN_CROSSES)
+    "eur_ngn": 1730, "gbp_ngn": 2020, "cny_ngn": 218, "cad_ngn": 1150,
+    "kes_ngn": 12.3, "ghs_ngn": 102,  "zar_ngn": 84,  "egp_ngn": 32,
+    "xof_ngn": 2.5,
+    # Market registry groups (image run only)
+    "sp500": 5500,      "ftse": 8200,      "dax": 18000,     "nikkei": 37000,
+    "dxy": 103.5,       "jse": 80000,      "egx": 30000,     "nse_k": 198300,
+    "silver_usd": 32.0, "cocoa_usd": 8500,
+    # Hand-maintained tier 2–4 figures in cache.json (image run only)
+    "kerosene": 950,    "dangote_output": 350, "nnpc_import": 32.4,
+    "unemployment": 4.3, "poverty_rate": 40.1, "literacy_rate": 62.0,
+    "avg_income_formal": 420000, "petrol_2023_baseline": 200, "yr_ago_rate": 1490,
+}
+
+# field → where cache.json keeps it
+CACHE_KEYS = {
+    "parallel": ("last_parallel",), "cbn": ("last_cbn",),
+    "btc_usd": ("last_btc_usd",),   "eth_usd": ("last_eth_usd",),
+    "bnb_usd": ("last_bnb_usd",),   "sol_usd": ("last_sol_usd",),
+    "gold_usd": ("last_gold_usd",), "brent": ("last_brent",),
+    "eur_ngn": ("last_eur_ngn",),   "gbp_ngn": ("last_gbp_ngn",),
+    "cad_ngn": ("last_cad_ngn",),
+    "inflation": ("tier4", "inflation"),
+    "petrol": ("tier2", "petrol"),  "diesel": ("tier2", "diesel"),
+    "lpg_kg": ("tier2", "lpg_kg"),  "reserves": ("tier2", "reserves"),
+    "ngx": ("tier2", "ngx_index"),  "ngx_chg": ("tier2", "ngx_change"),
+    "oil_production": ("tier3", "oil_production"),
+    "rice_50kg": ("tier4", "rice_50kg"), "tomato_basket": ("tier4", "tomato_basket"),
+    "egg_crate": ("tier4", "egg_crate"), "bread_loaf": ("tier4", "bread_loaf"),
+    "prev_inflation": ("prev_inflation_month",),
+    "prev_petrol": ("prev_petrol_month",),
+}
+
+
+class LiveData(Mapping):
+    __slots__ = FIELDS + ("written_at",)
+
+    def __init__(self, values, written_at=None):
+        for name in FIELDS:
+            object.__setattr__(self, name, values.get(name))
+        object.__setattr__(self, "written_at", written_at)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LiveData is immutable")
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def to_bytes(self):
+        ints = nones = 0
+        vals = []
+        for i, name in enumerate(FIELDS):
+            v = getattr(self, name)
+            if v is None:
+                nones |= 1 << i
+                v = 0.0
+            elif isinstance(v, int):
+                ints |= 1 << i
+            vals.append(float(v))
+        return (HEADER.pack(MAGIC, SCHEMA, self.written_at or 0.0, ints, nones)
+                + VALUES.pack(*vals))
+
+    @classmethod
+    def from_bytes(cls, buf):
+        """LiveData from to_bytes() output, or None if it is not a current snapshot."""
+        if len(buf) != HEADER.size + VALUES.size:
+            return None
+        magic, schema, written_at, ints, nones = HEADER.unpack_from(buf)
+        if magic != MAGIC or schema != SCHEMA:
+            return None
+        raw = VALUES.unpack_from(buf, HEADER.size)
+        values = {name: None if nones >> i & 1 else int(v) if ints >> i & 1 else v
+                  for i, (name, v) in enumerate(zip(FIELDS, raw))}
+        return cls(values, written_at)
+
+
+_FIELD_SET = frozenset(FIELDS)
+
+
+def _from_cache(cache, name):
+    """cache.json's value for a field (None included), else its fallback."""
+    if name not in CACHE_KEYS:
+        return FALLBACKS.get(name)
+    node = cache
+    for key in CACHE_KEYS[name]:
+        if not isinstance(node, dict) or key not in node:
+            return FALLBACKS.get(name)
+        node = node[key]
+    return node
+
+
+def collect(cache, data=None, now=None):
+    """
+    LiveData from this run's data (image run) or, with
+    data=None, from cache.json alone (text run without a usable snapshot).
+    A field takes the run's value, else cache.json's, else FALLBACKS.
+    """
+    data = data or {}
+    now  = now or datetime.datetime.now()
+    values = {name: data[name] if name in data else _from_cache(cache, name)
+              for name in FIELDS}
+
+    parallel = values["parallel"]
+    month_ago = now.date() - datetime.timedelta(days=30)
+    values["prev_parallel"] = history_store.value_on("parallel", month_ago) \
+                              or cache.get("prev_parallel_month", parallel)
+    if values["prev_petrol"] is None:
+        values["prev_petrol"] = values["petrol"]
+    if values["prev_inflation"] is None:
+        values["prev_inflation"] = values["inflation"]
+    if values["usd_wk_hi"] is None:
+        usd_week = rolling.load(cache, "usd_week", now.timestamp())
+        btc_week = rolling.load(cache, "btc_week", now.timestamp())
+        values["usd_wk_hi"] = usd_week.max() or parallel
+        values["usd_wk_lo"] = usd_week.min() or parallel
+        values["btc_wk_hi"] = btc_week.max() or 0
+        values["btc_wk_lo"] = btc_week.min() or 0
+    if values["aza"] is None:
+        values.update(aza_ring.trend(aza_ring.load()))
+    return LiveData(values, now.timestamp())
+
+
+def save(snap, path=SNAPSHOT_FILE):
+    with open(path + ".tmp", "wb") as f:
+        f.write(snap.to_bytes())
+    os.replace(path + ".tmp", path)
+
+
+def load(path=SNAPSHOT_FILE):
+    """The image run's snapshot, or None if missing or written by another schema."""
+    try:
+        with open(path, "rb") as f:
+            snap = LiveData.from_bytes(f.read())
+    except OSError:
+        return None
+    if snap is None:
+        print(f"[WARN] Snapshot: {path} is not a current live-data snapshot — ignoring")
+    return snap
@@ -0,0 +1,32 @@
+"""
+test_history_store.py — Torn-append handling in history_store
+
+Run with:  python -m pytest -q test_history_store.py
+"""
+
+import os
+
+import history_store
+
+
+def _use_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(history_store, "HISTORY_DIR", str(tmp_path))
+    monkeypatch.setattr(history_store, "META_FILE", str(tmp_path / "meta.json"))
+
+
+def test_partial_val_row_is_ignored_then_repaired(monkeypatch, tmp_path):
+    _use_dir(monkeypatch, tmp_path)
+    history_store.upsert("brent", [("2025-01-01", 80.0), ("2025-01-02", 81.0),
+                                   ("2025-01-03", 82.0)])
+    _, val_path = history_store._paths("brent")
+
+    # An append interrupted mid-row: the last value is only half written
+    with open(val_path, "r+b") as f:
+        f.truncate(os.path.getsize(val_path) - 4)
+
+    assert history_store.rows("brent") == [("2025-01-01", 80.0), ("2025-01-02", 81.0)]
+
+    history_store.upsert("brent", [("2025-01-04", 83.0)])
+    assert history_store.rows("brent") == [("2025-01-01", 80.0), ("2025-01-02", 81.0),
+                                           ("2025-01-04", 83.0)]
+    assert os.path.getsize(val_path) == 3 * 8
@@ -15,6 +15,9 @@ import json
 import os
 import sys
 
+import metrics
+import snapshot
+
 # WAT = UTC+1. Defined at module level so all functions can use it.
 # GitHub Actions runners are UTC — we never rely on TZ env var.
 WAT = datetime.timezone(datetime.timedelta(hours=1))
@@ -44,67 +47,24 @@ def save_cache(cache):
 
 def build_live_data_from_cache(cache):
     """
-    Reconstruct the live_data dict from cached values.
-    This avoids re-fetching all APIs — the image bot already
-    fetched everything and cached it. We just read the cache.
+    Reconstruct live data when the image run's snapshot is missing or was
+    written by an older deploy. This avoids re-fetching all APIs — the image
+    bot already fetched everything and cached it. We just read the cache.
     """
-    t2 = cache.get("tier2", {})
-    t4 = cache.get("tier4", {})
-    wt = cache.get("weekly_tracking", {})
+    return snapshot.collect(cache)
 
-    parallel      = cache.get("last_parallel", 1499)
-    prev_parallel = cache.get("prev_parallel_month", parallel)
-    petrol        = t2.get("petrol", 897)
-    prev_petrol   = cache.get("prev_petrol_month", petrol)
-    inflation     = t4.get("inflation", 33.2)
-    prev_inflation = cache.get("prev_inflation_month", inflation)
 
-    return {
-        "parallel":       parallel,
-        "cbn":            cache.get("last_cbn", 1346),
-        "spread_pct":     round(((parallel - cache.get("last_cbn", 1346)) /
-                                  cache.get("last_cbn", 1346)) * 100, 2)
-                          if cache.get("last_cbn", 1346) > 0 else 0,
-        "prev_parallel":  prev_parallel,
-        "btc_usd":        cache.get("last_btc_usd", 68000),
-        "eth_usd":        cache.get("last_eth_usd", 2100),
-        "gold_usd":       cache.get("last_gold_usd", 2930),
-        "brent":          cache.get("last_brent", 75),
-        "inflation":      inflation,
-        "prev_inflation": prev_inflation,
-        "petrol":         petrol,
-        "prev_petrol":    prev_petrol,
-        "diesel":         t2.get("diesel", 1450),
-        "lpg_kg":         t2.get("lpg_kg", 1200),
-        "ngx":            t2.get("ngx_index", 104520),
-        "ngx_chg":        t2.get("ngx_change", 0.6),
-        "reserves":       t2.get("reserves", 34.2),
-        "oil_production": cache.get("tier3", {}).get("oil_production", 1.42),
-        "usd_wk_hi":      wt.get("usd_ngn_week_high", parallel),
-        "usd_wk_lo":      wt.get("usd_ngn_week_low", parallel),
-        "btc_wk_hi":      wt.get("btc_week_high", 0),
-        "btc_wk_lo":      wt.get("btc_week_low", 0),
-        "salary_usd":     round(500000 / parallel) if parallel else 333,
-        "yr":             datetime.datetime.now(tz=WAT).year,
-        "eur_ngn":        cache.get("last_eur_ngn", 1590),
-        "gbp_ngn":        cache.get("last_gbp_ngn", 1820),
-        "cad_ngn":        cache.get("last_cad_ngn", 1010),
-        "bnb_usd":        cache.get("last_bnb_usd", 600),
-        "sol_usd":        cache.get("last_sol_usd", 150),
-        "diesel":         t2.get("diesel", 1450),
-        "spread_ngn":     round(parallel - cache.get("last_cbn", 1346), 0),
-        # Food prices — updated manually in cache.json tier4 when prices change
-        # Same update pattern as inflation: change the value, commit cache.json
-        "rice_50kg":      t4.get("rice_50kg", 95000),
-        "tomato_basket":  t4.get("tomato_basket", 3000),
-        "egg_crate":      t4.get("egg_crate", 3200),
-        "bread_loaf":     t4.get("bread_loaf", 1200),
-        # Daily survival estimate = (rice per day + transport + misc)
-        # Derived: rice_50kg / 30 days + 2 bus rides + misc
-        "food_daily":     round(t4.get("rice_50kg", 95000) / 30 +
-                                t4.get("tomato_basket", 3000) / 15 +
-                                t4.get("bread_loaf", 1200) / 3, -2),
-    }
+def load_live_data(cache):
+    """
+    The image run's live-data snapshot (one file read), else a rebuild from
+    cache.json. Derived values (spread_pct, salary_usd, food_daily, …) are
+    metrics.py nodes, computed only if a post reads them.
+    """
+    snap = snapshot.load()
+    if snap is None:
+        print("[INFO] No live-data snapshot — rebuilding from cache.json")
+        snap = build_live_data_from_cache(cache)
+    return metrics.Metrics(snap)
 
 
 def main():
@@ -153,8 +113,8 @@ def main():
         print(f"[INFO] Slot {slot_hour:02d}:00 already posted today. Skipping.")
         sys.exit(0)
 
-    # Load cache and build live data (already loaded above for double-post guard)
-    live_data = build_live_data_from_cache(cache)
+    # Live data from the image run's snapshot (cache loaded above for double-post guard)
+    live_data = load_live_data(cache)
 
     print(f"[INFO] Live data: parallel=₦{live_data['parallel']:,} "
           f"inflation={live_data['inflation']}% "
@@ -13,9 +13,10 @@ import datetime
 import json
 import os
 import re
-import requests
 import tweepy
 
+import http_cache
+
 CACHE_FILE = os.path.join(os.path.dirname(__file__), "cache.json")
 
 
@@ -289,6 +290,7 @@ TYPE_C_TEMPLATES = [
     "mobile_money_stats",      # NIP volumes + charge math
     "dollar_cost_averaging",   # weekly naira-to-dollar conversion table
     "fintech_news",            # latest headline from TechCabal/Nairametrics RSS
+    "aza_trend",               # Aza Index vs yesterday / last week + 30-day range (live)
 ]
 
 
@@ -321,30 +323,40 @@ def scrape_weekly_data(cache):
     return result
 
 
-def _scrape_fintech_news():
-    """Fetch latest finance/fintech headline. Tries TechCabal then Nairametrics RSS."""
+def _parse_fintech_feed(text):
+    """Pick the first keyword-matching headline from an RSS body."""
+    import feedparser
     keywords = ["fintech", "bank", "payment", "funding", "naira", "CBN",
                 "raise", "million", "billion", "launch", "acquire", "invest"]
+    feed = feedparser.parse(text)
+    if not feed.entries:
+        return None
+    for entry in feed.entries[:15]:
+        title = entry.get("title", "").lower()
+        if any(kw in title for kw in keywords):
+            return {
+                "headline": entry.get("title", ""),
+                "link":     entry.get("link", ""),
+                "date":     entry.get("published", ""),
+            }
+    # No keyword match — return first entry anyway
+    e = feed.entries[0]
+    return {"headline": e.get("title",""), "link": e.get("link",""), "date": e.get("published","")}
+
+
+def _scrape_fintech_news():
+    """
+    Fetch latest finance/fintech headline. Tries TechCabal then Nairametrics RSS.
+    Feeds go through http_cache — an unchanged feed (304) is not re-parsed.
+    """
     for feed_url in [
         "https://techcabal.com/feed/",
         "https://nairametrics.com/feed/",
     ]:
         try:
-            import feedparser
-            feed = feedparser.parse(feed_url)
-            if not feed.entries:
-                continue
-            for entry in feed.entries[:15]:
-                title = entry.get("title", "").lower()
-                if any(kw in title for kw in keywords):
-                    return {
-                        "headline": entry.get("title", ""),
-                        "link":     entry.get("link", ""),
-                        "date":     entry.get("published", ""),
-                    }
-            # No keyword match — return first entry anyway
-            e = feed.entries[0]
-            return {"headline": e.get("title",""), "link": e.get("link",""), "date": e.get("published","")}
+            news = http_cache.get_parsed(feed_url, _parse_fintech_feed, timeout=15)
+            if news:
+                return news
         except Exception as ex:
             print(f"[WARN] Type C RSS {feed_url}: {ex}")
     return None
@@ -760,6 +772,31 @@ def render_type_c(template_name, type_c_data, live_data):
         )
         return _fit(post)
 
+    # ── 21. Aza Index trend ───────────────────────────────────────────────────
+    elif template_name == "aza_trend":
+        # Run-resolution history from aza_ring.py (3 readings a day)
+        aza = d.get("aza")
+        if aza is None:
+            return None
+        zone = ("STRONG" if aza >= 75 else "STRAINED" if aza >= 50
+                else "STRESSED" if aza >= 25 else "CRISIS")
+
+        def pts(chg):
+            return "no reading" if chg is None else \
+                   "unchanged" if chg == 0 else \
+                   f"{'▲' if chg > 0 else '▼'}{abs(chg)} pt{'' if abs(chg) == 1 else 's'}"
+
+        post = (
+            f"Aza Index — Nigeria's economic health score:\n\n"
+            f"📍 Now: {aza}/100 ({zone})\n"
+            f"🕐 vs this time yesterday: {pts(d.get('aza_day_chg'))}\n"
+            f"📅 vs last week: {pts(d.get('aza_chg'))}\n"
+            f"↔️  30-day range: {d.get('aza_30d_lo', aza)}–{d.get('aza_30d_hi', aza)}\n\n"
+            f"Built from the FX spread, inflation, fuel, crypto and NGX.\n\n"
+            f"📊 NairaIntel"
+        )
+        return _fit(post)
+
     return None
 
 
@@ -22,6 +22,8 @@ have been moved to facts_pool.py (Type A) where the audience is everyday
 Nigerians, not institutions. See bottom of file for the full list.
 """
 
+import metrics
+
 HANDLES = {
     "cbn":          "@cenbank",
     "nnpc":         "@nnpclimited",
@@ -322,6 +324,28 @@ TYPE_F_FACTS = [
 # ==============================================================================
 
 
+# Fallbacks for inputs missing from live_data. spread_pct is always computed
+# from parallel and cbn, not the fixed 16.1 it defaulted to before metrics.py.
+TYPE_F_DEFAULTS = {
+    "parallel":   1559,
+    "cbn":        1342,
+    "inflation":  33.2,
+    "petrol":     897,
+    "ngx":        104520,
+    "brent":      75,
+    "gold_usd":   2930,
+    "reserves":   34.2,
+    "lpg_kg":     1200,
+}
+
+# Template placeholder → metrics.METRICS node of the same value
+TYPE_F_ALIASES = {
+    "remittance_ngn":   "remittance_ngn_2023",   # cites the $19.5B 2023 figure
+    "poverty_line_ngn": "poverty_line_naira",
+    "remit_500_ngn":    "parallel_500",
+}
+
+
 def get_type_f_count():
     return len(TYPE_F_FACTS)
 
@@ -342,51 +366,7 @@ def render_type_f(index, live_data):
     if tag_key and tag_key in HANDLES:
         tag_subs[f"{tag_key}_tag"] = HANDLES[tag_key]
 
-    parallel   = live_data.get("parallel", 1559)
-    inflation  = live_data.get("inflation", 33.2)
-    petrol     = live_data.get("petrol", 897)
-    ngx        = live_data.get("ngx", 104520)
-    yr         = live_data.get("yr", 2026)
-    cbn        = live_data.get("cbn", 1342)
-    brent      = live_data.get("brent", 75)
-    gold_usd   = live_data.get("gold_usd", 2930)
-    reserves   = live_data.get("reserves", 34.2)
-    spread_pct = live_data.get("spread_pct", 16.1)
-    lpg_kg     = live_data.get("lpg_kg", 1200)
-
-    tbill_real        = round(20 - inflation, 1)
-    daily_oil_rev     = round(1.4e6 * (brent * 0.2) / 1e6, 0)
-    efcc_recovery_ngn = round(1.2e9 * parallel / 1e12, 1)
-    remittance_ngn    = round(19.5e9 * parallel / 1e12, 1)
-    uk_salary_naira   = round(3500 * parallel, 0)
-    import_cover      = round(reserves / 50 * 12, 0)
-    min_wage_usd      = round(70000 / parallel, 1)
-    poverty_line_ngn  = round(2.15 * parallel, 0)
-    remit_500_ngn     = round(500 * parallel, 0)
-
-    subs = {
-        "parallel":          parallel,
-        "inflation":         inflation,
-        "petrol":            petrol,
-        "ngx":               ngx,
-        "yr":                yr,
-        "cbn":               cbn,
-        "brent":             brent,
-        "gold_usd":          gold_usd,
-        "reserves":          reserves,
-        "spread_pct":        spread_pct,
-        "lpg_kg":            lpg_kg,
-        "tbill_real":        tbill_real,
-        "daily_oil_rev":     daily_oil_rev,
-        "efcc_recovery_ngn": efcc_recovery_ngn,
-        "remittance_ngn":    remittance_ngn,
-        "uk_salary_naira":   uk_salary_naira,
-        "import_cover":      import_cover,
-        "min_wage_usd":      min_wage_usd,
-        "poverty_line_ngn":  poverty_line_ngn,
-        "remit_500_ngn":     remit_500_ngn,
-        **tag_subs,
-    }
+    subs = metrics.Metrics(live_data, {**TYPE_F_DEFAULTS, **tag_subs}, TYPE_F_ALIASES)
 
     try:
         import re